@@ -4,6 +4,7 @@ Module for torch calibration models and relevant functions
 import torch
 import numpy as np
 import copy
+import weakref
 
 from . import utils, linalg, dataset, telescope_model, linear_model, optim
 
@@ -17,7 +18,8 @@ class BaseResponse:
     """
     def __init__(self, freq_mode='channel', time_mode='channel', param_type='com',
                  device=None, freq_kwargs={}, time_kwargs={}, LM=None,
-                 time_dim=3, freq_dim=4, projection_kwargs={}, base0=None):
+                 time_dim=3, freq_dim=4, projection_kwargs={}, base0=None,
+                 linear_dtype=None):
         """
         Parameters
         ----------
@@ -54,6 +56,15 @@ class BaseResponse:
             Starting response to add to self(params). This redefines
             the forward model as a perturbation about base0. Must have
             the same shape as self(params) output.
+        linear_dtype : torch.dtype, optional
+            If provided (e.g. torch.bfloat16), apply real-valued
+            polynomial freq and time models in this reduced
+            precision, casting the output back to the params dtype.
+            Only used if both are fused (see _setup_real_linear()),
+            and only for real-valued params (including 'com' params
+            in 2-real form). Complex params are always applied in
+            full precision. This is meant for forward-only evaluation,
+            not for solves that need full precision.
         """
         self.freq_mode = freq_mode
         self.time_mode = time_mode
@@ -63,6 +74,7 @@ class BaseResponse:
         self.time_kwargs = time_kwargs
         self.time_dim = time_dim
         self.freq_dim = freq_dim
+        self.linear_dtype = linear_dtype
         self.setup_freqs(**freq_kwargs)
         self.setup_times(**time_kwargs)
         self.setup_projection(**projection_kwargs)
@@ -107,6 +119,8 @@ class BaseResponse:
         else:
             raise ValueError("{} not recognized".format(self.time_mode))
 
+        self._setup_real_linear()
+
     def setup_freqs(self, freqs=None, **kwargs):
         """
         Setup frequency parameterization. See required and optional
@@ -141,6 +155,8 @@ class BaseResponse:
         else:
             raise ValueError("{} not recognized".format(self.freq_mode))
 
+        self._setup_real_linear()
+
     def forward(self, params, **kwargs):
         """
         Forward pass params through response
@@ -153,20 +169,23 @@ class BaseResponse:
         if self.LM is not None:
             params = self.LM(params)
 
+        # make sure the cached linear A matrices are up to date
+        self._check_real_linear()
+
         # detect if params needs to be casted into complex
+        real_A = None
         if self.param_type == 'com' and not torch.is_complex(params):
+            real_A = getattr(self, '_real_A', None)
+            if real_A is not None:
+                # linear models are real-valued: apply them to the
+                # 2-real params before casting, avoiding a complex matmul
+                params = self.forward_linear(params, **real_A)
             params = utils.viewcomp(params)
 
         # convert representation to full Ntimes, Nfreqs
-        if self.freq_mode == 'channel':
-            pass
-        elif self.freq_mode == 'linear':
-            params = self.freq_LM(params)
-
-        if self.time_mode == 'channel':
-            pass
-        elif self.time_mode == 'linear':
-            params = self.time_LM(params)
+        if real_A is None:
+            fused_A = getattr(self, '_fused_A', None)
+            params = self.forward_linear(params, **(fused_A if fused_A is not None else {}))
 
         if hasattr(self, 'base0') and self.base0 is not None:
             params = params + self.base0
@@ -178,6 +197,122 @@ class BaseResponse:
 
         return params
 
+    def forward_linear(self, params, freq_A=None, time_A=None):
+        """
+        Pass params through the freq and time linear models (if any)
+
+        Parameters
+        ----------
+        params : tensor
+            Parameter tensor
+        freq_A, time_A : tensor, optional
+            Use these design matrices instead of the
+            freq_LM.A and time_LM.A matrices
+
+        Returns
+        -------
+        tensor
+        """
+        if freq_A is not None and time_A is not None:
+            # contract both dims at once, rather than two
+            # separate (and permuted) single-dim contractions
+            return self._fused_linear(params, freq_A, time_A)
+
+        if self.freq_mode == 'linear':
+            params = self.freq_LM(params, A=freq_A)
+
+        if self.time_mode == 'linear':
+            params = self.time_LM(params, A=time_A)
+
+        return params
+
+    def _fused_linear(self, params, freq_A, time_A):
+        """
+        Apply freq_A and time_A along self.freq_LM.dim and
+        self.time_LM.dim of params in a single einsum
+        """
+        chars = ['a', 'b', 'c', 'd', 'e', 'g', 'h', 'i']
+        assert params.ndim <= len(chars)
+        inp = chars[:params.ndim]
+        inp[self.freq_LM.dim] = 'f'
+        inp[self.time_LM.dim] = 't'
+        inp = ''.join(inp)
+        out = inp.replace('f', 'F').replace('t', 'T')
+        eq = "Ff,Tt,{}->{}".format(inp, out)
+
+        if freq_A.dtype != params.dtype or time_A.dtype != params.dtype:
+            if torch.is_complex(params):
+                # reduced precision (see linear_dtype) only applies to
+                # real params: use the full precision A matrices instead
+                if freq_A.dtype == getattr(self, 'linear_dtype', None):
+                    freq_A, time_A = self.freq_LM.A, self.time_LM.A
+                freq_A, time_A = freq_A.to(params.dtype), time_A.to(params.dtype)
+            else:
+                # reduced precision A matrices: see linear_dtype
+                dtype = params.dtype
+                lin_dtype = freq_A.dtype
+                return torch.einsum(eq, freq_A, time_A.to(lin_dtype),
+                                    params.to(lin_dtype)).to(dtype)
+
+        return torch.einsum(eq, freq_A, time_A, params)
+
+    def _setup_real_linear(self):
+        """
+        Check if the freq and time linear models are simple polynomial
+        models acting on a non-negative dim, such that they can be applied
+        directly with their A matrices. If both are, cache them as
+        self._fused_A, to be applied in a single einsum (else None).
+        For param_type 'com', also check that they are real-valued
+        (i.e. their imaginary parts are zero) and can act on 2-real params,
+        and if so cache their real A matrices as self._real_A.
+        Otherwise self._real_A = None.
+        """
+        self._real_A, self._fused_A = None, None
+        self._linear_src = self._linear_A_src()
+        A = {}
+        for mode, key in zip([self.freq_mode, self.time_mode], ['freq', 'time']):
+            if mode != 'linear':
+                continue
+            LM = getattr(self, '{}_LM'.format(key), None)
+            if not isinstance(LM, linear_model.LinearModel) or LM.linear_mode != 'poly':
+                return
+            if LM.diag or LM.dim < 0 or LM.coeff is not None or LM.idx is not None:
+                return
+            if LM.out_dtype is not None or LM.out_shape is not None:
+                return
+            A['{}_A'.format(key)] = LM.A
+        if len(A) == 2:
+            self._fused_A = A
+        if self.param_type == 'com' and len(A) > 0:
+            if all(not torch.is_complex(a) or (a.imag == 0).all() for a in A.values()):
+                self._real_A = {k: a.real.contiguous() if torch.is_complex(a) else a
+                                for k, a in A.items()}
+        dtype = getattr(self, 'linear_dtype', None)
+        if dtype is not None:
+            # cast the real-valued, fused A matrices (i.e. those that
+            # act on real params) to reduced precision
+            A = self._real_A if self.param_type == 'com' else self._fused_A
+            if A is not None and len(A) == 2 and not torch.is_complex(A['freq_A']):
+                for k in A:
+                    A[k] = A[k].to(dtype)
+
+    def _linear_A_src(self):
+        """
+        Get the current freq_LM and time_LM A matrices (or None)
+        """
+        return tuple(getattr(getattr(self, '{}_LM'.format(k), None), 'A', None)
+                     for k in ['freq', 'time'])
+
+    def _check_real_linear(self):
+        """
+        Re-run _setup_real_linear() if the freq or time LinearModel
+        A matrices have been replaced since it was last run
+        (e.g. by directly setting self.freq_LM)
+        """
+        src = getattr(self, '_linear_src', None)
+        if src is None or any(a is not b for a, b in zip(src, self._linear_A_src())):
+            self._setup_real_linear()
+
     def params2complex(self, params):
         """
         Given param_type, convert params to complex form.
@@ -213,6 +348,7 @@ class BaseResponse:
             self.freq_LM.push(device)
         if self.time_mode == 'linear':
             self.time_LM.push(device)
+        self._setup_real_linear()
 
     def setup_projection(self, abs_amp_gain=False, phs_slope_gain=False,
                          wgts_gain=None, refant_idx=None):
@@ -310,10 +446,10 @@ def params2complex(params, param_type):
         params = torch.exp(params) + 0j
 
     elif param_type == 'phs':
-        params = torch.exp(1j * params)
+        params = linalg.phasor(params)
 
     elif param_type == 'amp_phs':
-        params = torch.exp(params[..., 0] + 1j * params[..., 1])
+        params = torch.polar(torch.exp(params[..., 0]), params[..., 1])
 
     return params
 
@@ -400,7 +536,12 @@ class IndexCache:
         else:
             # compute time indices
             assert hasattr(self, '_times')
-            idx = [torch.where(torch.isclose(self._times, t, atol=self._atol, rtol=1e-15))[0][0] for t in times]
+            # match all times at once, taking the first match of each
+            times = torch.as_tensor(times, device=self._times.device)
+            match = torch.isclose(times[:, None], self._times[None, :],
+                                  atol=self._atol, rtol=1e-15)
+            assert match.any(dim=1).all(), "times not found in self._times"
+            idx = match.int().argmax(dim=1).tolist()
             idx = utils._list2slice(idx)
             # store in cache and return
             self.cache_tidx[h] = idx
@@ -484,7 +625,8 @@ class JonesModel(utils.Module, IndexCache):
     """
     def __init__(self, params, ants, p0=None, refant=None, R=None,
                  parameter=True, polmode='1pol', single_ant=False, name=None,
-                 vis_type='com', atol=1e-5):
+                 vis_type='com', atol=1e-5, compile_cal=False, cal_dtype=None,
+                 cache_gains=False, lazy_refant=False):
         """
         Antenna-based Jones model.
 
@@ -530,13 +672,40 @@ class JonesModel(utils.Module, IndexCache):
             Type of visibility, complex or delay ['com', 'dly']
         atol : float, optional
             Absolute tolerance for time index caching
+        compile_cal : bool, optional
+            If True, apply gains with torch.compile'd
+            kernels. See apply_cal()
+        cal_dtype : torch.dtype, optional
+            If provided, apply gains in this (reduced) precision
+            when no gradient is needed. See apply_cal()
+        cache_gains : bool, optional
+            If True, and the 1pol or 2pol gains don't require grad
+            (e.g. frozen params or under torch.no_grad), keep their
+            baseline gain product (Npol, Npol, Nbls, Ntimes, Nfreqs)
+            from the last forward call and reuse it if the gains,
+            baselines and times are unchanged. This trades memory
+            for speed when repeatedly calling forward with fixed
+            gains. Default is False.
+        lazy_refant : bool, optional
+            If True, only re-fix the refant phase on forward after
+            params have been invalidated: by a torch.optim optimizer
+            step, reassignment of params or p0, load_state_dict(),
+            push() or clear_cache(). Use this only if params are
+            updated through these routes (e.g. not by writing to
+            params.data directly). Default is False, which fixes
+            the refant phase on every forward call.
         """
         super().__init__(name=name)
         self.params = params
         self.device = params.device
         self.p0 = p0
+        self.compile_cal = compile_cal
+        self.cal_dtype = cal_dtype
+        self.cache_gains = cache_gains
+        self.lazy_refant = lazy_refant
         self.ants = list(ants)
         self.Nants = len(self.ants)
+        self._ant_idx = {a: i for i, a in enumerate(self.ants)}
         if parameter:
             self.params = torch.nn.Parameter(self.params)
         if R is None:
@@ -548,8 +717,8 @@ class JonesModel(utils.Module, IndexCache):
         self.polmode = polmode
         self.single_ant = single_ant
         self.vis_type = vis_type
-        self.set_refant(refant)
         self.clear_cache()
+        self.set_refant(refant)
 
         # construct _args for str repr
         self._args = dict(refant=refant, polmode=polmode)
@@ -560,6 +729,8 @@ class JonesModel(utils.Module, IndexCache):
         self.clear_time_cache()
         self.clear_bl_cache()
         self.clear_ant_cache()
+        self._gain_cache = None
+        self._refant_fixed = False
 
     def clear_ant_cache(self):
         self.cache_aidx = {}
@@ -588,12 +759,10 @@ class JonesModel(utils.Module, IndexCache):
         h = utils.arr_hash(bls)
         if h not in self.cache_aidx:
             if self.single_ant:
-                g1_idx = torch.as_tensor([0 for bl in bls], device=self.device)
-                g2_idx = torch.as_tensor([0 for bl in bls], device=self.device)
+                g1_idx = torch.zeros(len(bls), dtype=torch.long, device=self.device)
+                g2_idx = g1_idx
             else:
-                bls = utils.blnum2ants(bls)
-                g1_idx = torch.as_tensor([self.ants.index(bl[0]) for bl in bls], device=self.device)
-                g2_idx = torch.as_tensor([self.ants.index(bl[1]) for bl in bls], device=self.device)
+                g1_idx, g2_idx = _bl_ant_idx(bls, self.ants, device=self.device)
             self.cache_aidx[h] = (g1_idx, g2_idx)
         else:
             g1_idx, g2_idx = self.cache_aidx[h]
@@ -613,9 +782,13 @@ class JonesModel(utils.Module, IndexCache):
         """
         self.refant, self.refant_idx = refant, None
         self.rephase_mode = None
+        # fix_refant_phs only has an effect for these param_types, so
+        # resolve once whether forward needs to call it at all
+        self._fix_refant = refant is not None and \
+            self.R.param_type in ['com', 'dly', 'phs', 'amp_phs']
         if refant is not None:
             assert self.refant in self.ants, "need a valid refant"
-            self.refant_idx = self.ants.index(self.refant)
+            self.refant_idx = self._ant_idx[self.refant]
             if self.R.time_mode == 'channel' and self.R.freq_mode == 'channel':
                 self.rephase_mode = 'rephase'
             else:
@@ -633,6 +806,25 @@ class JonesModel(utils.Module, IndexCache):
         with torch.no_grad():
             rephase_to_refant(self.params, self.R.param_type, self.refant_idx,
                               p0=self.p0, mode=self.rephase_mode, inplace=True)
+        self._refant_fixed = True
+        if getattr(self, 'lazy_refant', False):
+            # register for invalidation by optimizer steps
+            _LAZY_REFANT_MODELS.add(self)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ['params', 'p0']:
+            # params were replaced: re-fix refant on next forward
+            self.__dict__['_refant_fixed'] = False
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # copies aren't registered for optimizer step invalidation
+        self._refant_fixed = False
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        super()._load_from_state_dict(*args, **kwargs)
+        self._refant_fixed = False
 
     def forward(self, vd, undo=False, prior_cache=None, jones=None):
         """
@@ -659,14 +851,17 @@ class JonesModel(utils.Module, IndexCache):
             vd through the Jones parameters.
         """
         # fix reference antenna if needed
-        if self.refant_idx is not None:
-            self.fix_refant_phs()
+        if getattr(self, '_fix_refant', self.refant_idx is not None):
+            lazy = getattr(self, 'lazy_refant', False) and _register_step_hook is not None
+            if not (lazy and getattr(self, '_refant_fixed', False)):
+                self.fix_refant_phs()
 
         # push vd to self.device
         vd.push(self.device)
 
-        # setup empty VisData for output
-        vout = vd.copy()
+        # setup VisData for output: vout.data is replaced
+        # by _apply_cal below, so don't bother cloning it
+        vout = vd.copy(copydata=False)
 
         # add prior model for params
         if self.p0 is None:
@@ -675,7 +870,8 @@ class JonesModel(utils.Module, IndexCache):
             params = self.params + self.p0
 
         # push through reponse function
-        if jones is None:
+        jones_given = jones is not None
+        if not jones_given:
             jones = self.R(params)
 
         # register gradient hooks if desired
@@ -693,13 +889,73 @@ class JonesModel(utils.Module, IndexCache):
         # get g1 and g2 indexing
         g1_idx, g2_idx = self.get_ant_idx(vd._blnums)
 
+        # if gains are fixed (no grad), optionally reuse their baseline product
+        if (getattr(self, 'cache_gains', False) and self.polmode in ['1pol', '2pol']
+            and not jones_given and not (torch.is_grad_enabled() and jones.requires_grad)):
+            vout.data = self._apply_cached_gains(vd, jones, g1_idx, g2_idx, undo=undo)
+            return vout
+
         # apply calibration and insert into output vis
         vout.data, _ = _apply_cal(vd.data, jones, g1_idx, g2_idx,
                                  cal_2pol=self.polmode=='2pol',
-                                 vis_type=self.vis_type, undo=undo)
+                                 vis_type=self.vis_type, undo=undo,
+                                 compile_cal=getattr(self, 'compile_cal', False),
+                                 cal_dtype=getattr(self, 'cal_dtype', None))
 
         return vout
 
+    def _apply_cached_gains(self, vd, jones, g1_idx, g2_idx, undo=False):
+        """
+        Apply fixed (no grad) 1pol or 2pol gains to vd.data,
+        reusing the baseline gain product from the last call if the
+        gains, response function, baselines and times are unchanged.
+        Note that the gains are compared by value, rather than by the
+        state of params, p0 and R, which covers any change to them.
+
+        Parameters
+        ----------
+        vd : VisData
+        jones : tensor
+            Gains output from self.R, indexed to vd.times
+        g1_idx, g2_idx : tensor
+            Indexing tensors from get_ant_idx()
+        undo : bool, optional
+            If True, remove gains from vd.data
+
+        Returns
+        -------
+        tensor
+        """
+        assert vd.data.shape[:2] == jones.shape[:2], "vis and gains must have same Npols"
+        key = (utils.arr_hash(vd._blnums), utils.arr_hash(vd.times))
+        cache = getattr(self, '_gain_cache', None)
+        if (cache is None or cache['key'] != key or cache['R'] is not self.R
+            or cache['jones'].shape != jones.shape or cache['jones'].dtype != jones.dtype
+            or cache['jones'].device != jones.device
+            or not torch.equal(cache['jones'], jones)):
+            G = gain_product(jones, g1_idx, g2_idx, vis_type=self.vis_type)
+            # clone jones, which can be a view of params. G is
+            # stored at full precision, keyed by the dtype it is applied in
+            cache = dict(key=key, R=self.R, jones=jones.clone(), G={None: G})
+            self._gain_cache = cache
+
+        # only apply gains in reduced precision when vis needs no grad,
+        # just as in _apply_cal()
+        data = vd.data
+        cal_dtype = getattr(self, 'cal_dtype', None)
+        if cal_dtype is None or (torch.is_grad_enabled() and data.requires_grad):
+            cal_dtype = None
+        else:
+            data = data.to(cal_dtype)
+        if cal_dtype not in cache['G']:
+            cache['G'][cal_dtype] = cache['G'][None].to(cal_dtype)
+
+        apply = apply_gain_product
+        if getattr(self, 'compile_cal', False):
+            apply = _compiled(apply_gain_product)
+
+        return apply(data, cache['G'][cal_dtype], vis_type=self.vis_type, undo=undo).to(vd.data.dtype)
+
     def push(self, device):
         """
         Push params and other attrs to new device
@@ -800,7 +1056,8 @@ class JonesResponse(BaseResponse):
     """
     def __init__(self, freq_mode='channel', time_mode='channel', param_type='com',
                  vis_type='com', antpos=None, device=None,
-                 freq_kwargs={}, time_kwargs={}, LM=None, base0=None):
+                 freq_kwargs={}, time_kwargs={}, LM=None, base0=None,
+                 linear_dtype=None):
         """
         Parameters
         ----------
@@ -831,6 +1088,9 @@ class JonesResponse(BaseResponse):
         LM : LinearModel object, optional
             Pass the input params through this LinearModel
             object before passing through the response function.
+        linear_dtype : torch.dtype, optional
+            Reduced precision for the freq and time polynomial
+            models. See BaseResponse.
 
         Notes
         -----
@@ -838,26 +1098,37 @@ class JonesResponse(BaseResponse):
             antpos is required. params tensor is assumed
             to hold the [EW, NS] slope along its antenna axis.
         """
+        # vis_type is needed by setup_freqs() to build the delay phasor
+        self.vis_type = vis_type
         super().__init__(freq_mode=freq_mode, time_mode=time_mode,
                          param_type=param_type, device=device,
                          freq_kwargs=freq_kwargs, time_kwargs=time_kwargs,
-                         LM=LM, base0=base0)
-        self.vis_type = vis_type
+                         LM=LM, base0=base0, linear_dtype=linear_dtype)
         self.antpos = antpos
 
         if self.param_type in ['dly_slope', 'phs_slope']:
             # setup antpos tensors
             assert antpos is not None, 'need antpos for dly_slope or phs_slope'
-            EW = torch.as_tensor([antpos[a][0] for a in antpos], device=self.device)
-            self.antpos_EW = EW[None, None, :, None, None]  
-            NS = torch.as_tensor([antpos[a][1] for a in antpos], device=self.device)
-            self.antpos_NS = NS[None, None, :, None, None]
+            if not isinstance(antpos, utils.AntposDict):
+                antpos = utils.AntposDict(list(antpos.keys()), list(antpos.values()))
+            # (Nants, 2) tensor holding [EW, NS] antenna positions
+            self.antpos_xy = antpos.antvecs[:, :2].to(utils._float()).to(self.device)
         elif 'dly' in self.param_type:
             assert self.freqs is not None, 'need frequencies for delay gain type'
+        self._setup_params2complex()
 
         assert self.param_type in ['com', 'amp', 'phs', 'dly', 'real',
                                    'amp_phs', 'phs_slope', 'dly_slope']
 
+    def setup_freqs(self, freqs=None, **kwargs):
+        """
+        Setup frequency parameterization, and the delay
+        phasor for delay param_types.
+        See BaseResponse.setup_freqs() for details.
+        """
+        super().setup_freqs(freqs=freqs, **kwargs)
+        self._setup_dly_phasor()
+
     def params2complex(self, jones):
         """
         Convert jones to complex gain given param_type.
@@ -877,37 +1148,67 @@ class JonesResponse(BaseResponse):
         """
         jones = super().params2complex(jones)
 
-        if self.param_type == 'dly':
-            # assume jones are in delay [nanosec]
-            if self.vis_type == 'dly':
-                pass
-            elif self.vis_type == 'com':
-                jones = torch.exp(2j * np.pi * jones * torch.as_tensor(self.freqs / 1e9, dtype=jones.dtype))
+        if not hasattr(self, '_p2c'):
+            # object predates these cached attributes
+            self._setup_dly_phasor()
+            self._setup_params2complex()
 
-        elif self.param_type == 'dly_slope':
-            # extract EW and NS delay slopes: ns / meter
-            EW = jones[:, :, :1]
-            NS = jones[:, :, 1:]
-            # get total delay per antenna
-            tot_dly = EW * self.antpos_EW \
-                      + NS * self.antpos_NS
-            if self.vis_type == 'com':
-                # convert to complex gains
-                jones = torch.exp(2j * np.pi * tot_dly * self.freqs / 1e9)
-            elif self.vis_type == 'dly':
-                jones = tot_dly
+        # call the conversion resolved by _setup_params2complex()
+        if self._p2c is not None:
+            jones = getattr(self, self._p2c)(jones)
+
+        return jones
 
+    def _setup_params2complex(self):
+        """
+        Resolve the param_type and vis_type specific conversion
+        of params2complex once, storing its method name as self._p2c
+        (None if jones needs no further conversion)
+        """
+        self._p2c = None
+        if self.param_type == 'dly' and self.vis_type == 'com':
+            self._p2c = '_dly2complex'
+        elif self.param_type == 'dly_slope':
+            self._p2c = '_dly_slope2complex' if self.vis_type == 'com' else '_slope2total'
         elif self.param_type == 'phs_slope':
-            # extract EW and NS phase slopes: rad / meter
-            EW = jones[:, :, :1]
-            NS = jones[:, :, 1:]
-            # get total phase per antenna
-            tot_phs = EW * self.antpos_EW \
-                      + NS * self.antpos_NS
-            # convert to complex gains
-            jones = torch.exp(1j * tot_phs)
+            self._p2c = '_phs_slope2complex'
 
-        return jones
+    def _slope2total(self, jones):
+        """
+        Get the total delay or phase per antenna
+        from its EW and NS slopes [per meter]
+        """
+        if self.antpos_xy.dtype != jones.dtype:
+            # matmul doesn't promote dtypes: keep the cached
+            # antenna positions in the dtype of jones
+            self.antpos_xy = self.antpos_xy.to(jones.dtype)
+        return (jones.moveaxis(2, -1) @ self.antpos_xy.T).moveaxis(-1, 2)
+
+    def _dly2complex(self, jones):
+        # assume jones are in delay [nanosec]
+        if self._dly2phs.dtype != jones.dtype:
+            # keep the cached factor in the dtype of jones, so the
+            # phase isn't promoted (and recast) on every call
+            self._dly2phs = self._dly2phs.to(jones.dtype)
+        return linalg.phasor(jones * self._dly2phs)
+
+    def _dly_slope2complex(self, jones):
+        # delay slopes are ns / meter
+        return self._dly2complex(self._slope2total(jones))
+
+    def _phs_slope2complex(self, jones):
+        # phase slopes are rad / meter
+        return linalg.phasor(self._slope2total(jones))
+
+    def _setup_dly_phasor(self):
+        """
+        For delay param_types, cache the 2 pi freqs [GHz] tensor
+        that converts delay [nanosec] to phase as self._dly2phs
+        """
+        self._dly2phs = None
+        if 'dly' in self.param_type and self.vis_type == 'com' and self.freqs is not None:
+            self._dly2phs = torch.as_tensor(2 * np.pi * self.freqs / 1e9,
+                                            dtype=utils._float(), device=self.device)
 
     def push(self, device):
         """
@@ -915,8 +1216,9 @@ class JonesResponse(BaseResponse):
         """
         super().push(device)
         if self.param_type in ['dly_slope', 'phs_slope']:
-            self.antpos_EW = self.antpos_EW.to(device) 
-            self.antpos_NS = self.antpos_NS.to(device)
+            self.antpos_xy = utils.push(self.antpos_xy, device)
+        if getattr(self, '_dly2phs', None) is not None:
+            self._dly2phs = utils.push(self._dly2phs, device)
 
 
 class RedVisModel(utils.Module, IndexCache):
@@ -1005,8 +1307,9 @@ class RedVisModel(utils.Module, IndexCache):
         if not utils.check_devices(self.device, vd.data.device):
             vd.push(self.device)
 
-        # setup predicted visibility: this clones data
-        vout = vd.copy()
+        # setup predicted visibility: vout.data is replaced below,
+        # so don't bother cloning it
+        vout = vd.copy(copydata=False)
 
         # get unique visibilities
         if self.p0 is not None:
@@ -1032,11 +1335,11 @@ class RedVisModel(utils.Module, IndexCache):
             index = self.get_bl_idx(vd.bls)
             redvis = torch.index_select(redvis, 2, index)
 
-        # apply redvis model: not inplace b/c vout is not deepcopy
+        # apply redvis model: not inplace b/c vout.data is vd.data
         if not undo:
-            vout.data += redvis
+            vout.data = vout.data + redvis
         else:
-            vout.data -= redvis
+            vout.data = vout.data - redvis
 
         return vout
 
@@ -1170,7 +1473,8 @@ class VisModel(utils.Module, IndexCache):
             The predicted visibilities, having summed vd
             with the visibility model.
         """
-        vout = vd.copy()
+        # vout.data is replaced below, so don't bother cloning it
+        vout = vd.copy(copydata=False)
 
         # forward model params
         if self.p0 is not None:
@@ -1191,6 +1495,7 @@ class VisModel(utils.Module, IndexCache):
         # down select
         vis = self.index_params(vis, times=vd.times, bls=vd.bls)
 
+        # apply vis model: not inplace b/c vout.data is vd.data
         if not undo:
             vout.data = vout.data + vis
         else:
@@ -1224,7 +1529,8 @@ class VisModelResponse(BaseResponse):
     """
     def __init__(self, bls=None, freq_mode='channel', time_mode='channel',
                  param_type='real', device=None, time_dim=3, freq_dim=4,
-                 freq_kwargs={}, time_kwargs={}, LM=None, base0=None):
+                 freq_kwargs={}, time_kwargs={}, LM=None, base0=None,
+                 linear_dtype=None):
         """
         Parameters
         ----------
@@ -1246,11 +1552,14 @@ class VisModelResponse(BaseResponse):
         LM : LinearModel object, optional
             Pass the input params through this LinearModel
             object before passing through the response function.
+        linear_dtype : torch.dtype, optional
+            Reduced precision for the freq and time polynomial
+            models. See BaseResponse.
         """
         super().__init__(freq_mode=freq_mode, time_mode=time_mode, time_dim=time_dim,
                          freq_dim=freq_dim, param_type=param_type, device=device,
                          freq_kwargs=freq_kwargs, time_kwargs=time_kwargs, LM=LM,
-                         base0=base0)
+                         base0=base0, linear_dtype=linear_dtype)
 
     def forward(self, params, bls=None, times=None, **kwargs):
         """
@@ -2122,7 +2431,8 @@ class CouplingExpand:
 
 
 def apply_cal(vis, bls, gains, ants, cal_2pol=False, cov=None,
-              vis_type='com', undo=False, inplace=False):
+              vis_type='com', undo=False, inplace=False, compile_cal=False,
+              cal_dtype=None):
     """
     Apply calibration to a visibility tensor with a complex
     gain tensor. Default behavior is to multiply
@@ -2167,6 +2477,23 @@ def apply_cal(vis, bls, gains, ants, cal_2pol=False, cov=None,
         (default) multiply vis by gains.
     inplace : bool, optional
         If True edit input vis inplace, otherwise make a copy
+    compile_cal : bool, optional
+        If True, apply gains (without cov) using torch.compile'd
+        kernels, which fuse the gain product with its application
+        (or removal) to vis. This covers 1pol and 2pol complex
+        and delay gains and 4pol Jones matrices. Each kernel is
+        compiled on first use.
+    cal_dtype : torch.dtype, optional
+        If provided, cast vis and gains to this dtype before applying
+        gains, and cast the output back to the dtype of vis. This is
+        only done when no gradient is needed (i.e. neither vis nor
+        gains require grad, or grad mode is disabled) and cov is
+        None, e.g. for forward-only predictions. Reduced precision
+        (e.g. torch.complex32 for complex, or torch.bfloat16 or
+        torch.float16 for delays) halves the memory traffic of
+        this memory-bound operation at the cost of precision
+        (bfloat16 keeps only ~3 significant digits), and is
+        generally only supported on GPU for complex dtypes.
 
     Returns
     -------
@@ -2178,15 +2505,16 @@ def apply_cal(vis, bls, gains, ants, cal_2pol=False, cov=None,
     bls = utils.blnum2ants(bls)
     if isinstance(bls, tuple):
         bls = [bls]
-    g1_idx = torch.as_tensor([ants.index(bl[0]) for bl in bls], device=gains.device)
-    g2_idx = torch.as_tensor([ants.index(bl[1]) for bl in bls], device=gains.device)
+    g1_idx, g2_idx = _bl_ant_idx(bls, ants, device=gains.device)
 
     return _apply_cal(vis, gains, g1_idx, g2_idx, cal_2pol=cal_2pol, cov=cov,
-                      vis_type=vis_type, undo=undo, inplace=inplace)
+                      vis_type=vis_type, undo=undo, inplace=inplace,
+                      compile_cal=compile_cal, cal_dtype=cal_dtype)
 
 
 def _apply_cal(vis, gains, g1_idx, g2_idx, cal_2pol=False, cov=None,
-               vis_type='com', undo=False, inplace=False):
+               vis_type='com', undo=False, inplace=False, compile_cal=False,
+               cal_dtype=None):
     """
     Apply calibration
 
@@ -2207,25 +2535,17 @@ def _apply_cal(vis, gains, g1_idx, g2_idx, cal_2pol=False, cov=None,
     if cal_2pol and polmode == '4pol':
         polmode = '2pol'
 
-    # invert gains if necessary
-    if undo:
-        invgains = torch.zeros_like(gains)
-        # iterate over antennas
-        for i in range(gains.shape[2]):
-            if polmode in ['1pol', '2pol']:
-                if vis_type == 'com':
-                    invgains[:, :, i] = linalg.diag_inv(gains[:, :, i])
-                elif vis_type == 'dly':
-                    invgains[:, :, i] = -gains[:, :, i]
-            else:
-                assert vis_type == 'com', 'must have complex vis_type for 4pol mode'
-                invgains[:, :, i] = torch.pinv(gains[:, :, i])
-        gains = invgains
+    # invert gains if necessary: note that 1pol and 2pol
+    # kernels remove gains directly, so they don't need inverting
+    if polmode == '4pol':
+        assert vis_type == 'com', "must have complex vis_type for 4pol mode"
+        if undo:
+            # analytic 2x2 inverse, batched over antennas, times and freqs
+            gains = linalg.mat_inv(gains)
+            undo = False
 
-    if inplace:
-        vout = vis
-    else:
-        vout = torch.zeros_like(vis)
+    # note: vout is assigned by every branch below, so there
+    # is no need to preallocate it here
     if cov is not None:
         if inplace:
             cov_out = cov
@@ -2234,33 +2554,313 @@ def _apply_cal(vis, gains, g1_idx, g2_idx, cal_2pol=False, cov=None,
     else:
         cov_out = cov
 
+    # optionally apply gains in reduced precision for forward-only calls
+    out_dtype = None
+    if (cal_dtype is not None and cov is None
+        and not (torch.is_grad_enabled() and (vis.requires_grad or gains.requires_grad))):
+        out_dtype = vis.dtype
+        vis, gains = vis.to(cal_dtype), gains.to(cal_dtype)
+
+    g1, g2 = _bl_gains(gains, g1_idx, g2_idx)
+
+    if cov is not None and vis_type == 'com' and polmode in ['1pol', '2pol']:
+        # update visibilities
+        G = g1 * g2.conj()
+        vout = apply_gain_product(vis, G, vis_type=vis_type, undo=undo)
+
+        # update covariance
+        GG = G * G.conj()
+        if torch.is_complex(GG):
+            GG = GG.real
+        if undo:
+            cov_out = linalg.diag_div(cov, GG)
+        else:
+            cov_out = linalg.diag_matmul(GG, cov)
+
+    else:
+        # the kernel specialized to this polmode, vis_type and undo
+        kernel = _CAL_KERNELS[(polmode, vis_type, undo)]
+        if compile_cal:
+            kernel = _compiled(kernel)
+        vout = kernel(g1, vis, g2)
+
+    if out_dtype is not None:
+        vout = vout.to(out_dtype)
+
+    return vout, cov_out
+
+
+def _bl_ant_idx(bls, ants, device=None):
+    """
+    Get the index in ants of the ant1 and ant2 of each baseline,
+    looking up all baselines at once rather than one by one
+
+    Parameters
+    ----------
+    bls : ndarray, list
+        blnums ndarray or list of baseline tuples
+    ants : list
+        Antenna integers
+    device : str, optional
+        Device of the output index tensors
+
+    Returns
+    -------
+    g1_idx, g2_idx : tensor
+    """
+    ant1, ant2 = utils.blnum2ants(bls, separate=True)
+    ants = np.asarray(ants)
+    sort = np.argsort(ants)
+    idx = []
+    for a in [np.asarray(ant1), np.asarray(ant2)]:
+        i = sort[np.searchsorted(ants, a, sorter=sort).clip(0, len(ants) - 1)]
+        assert (ants[i] == a).all(), "bls have ants not in ants"
+        idx.append(torch.as_tensor(i, device=device))
+
+    return idx
+
+
+def _bl_gains(gains, g1_idx, g2_idx):
+    """
+    Index gains of shape (Npol, Npol, Nants, Ntimes, Nfreqs)
+    to the (g1, g2) gains of each baseline
+    """
     # legacy: haven't shown this is faster or more mem efficient, just is more verbose
     #g1 = torch.gather(gains, 2, g1_idx[None, None, :, None, None].expand_as(vis))
     #g2 = torch.gather(gains, 2, g2_idx[None, None, :, None, None].expand_as(vis))
-    g1 = gains.index_select(2, g1_idx)
-    g2 = gains.index_select(2, g2_idx)
+    if gains.shape[2] == 1:
+        # a single antenna gain (e.g. JonesModel single_ant mode) is shared
+        # by all baselines, so broadcast it as a view rather than gather it
+        shape = list(gains.shape)
+        shape[2] = len(g1_idx)
+        return gains.expand(shape), gains.expand(shape)
 
-    if polmode in ['1pol', '2pol']:
-        # update visibilities
-        if vis_type == 'com':
-            G = g1 * g2.conj()
-            vout = linalg.diag_matmul(G, vis)
+    return gains.index_select(2, g1_idx), gains.index_select(2, g2_idx)
 
-            # update covariance
-            if cov is not None:
-                GG = G * G.conj()
-                if torch.is_complex(GG):
-                    GG = GG.real
-                cov_out = linalg.diag_matmul(GG, cov)
 
-        elif vis_type == 'dly':
-            vout = vis + g1 - g2
+def gain_product(gains, g1_idx, g2_idx, vis_type='com'):
+    """
+    Compute the 1pol or 2pol baseline gain product,
+    g1 g2^* for complex gains or g1 - g2 for delays.
+    This depends only on gains and the baseline
+    ordering, so it can be precomputed once and reused
+    across many visibilities with apply_gain_product()
+    when the gains are held fixed.
+
+    Parameters
+    ----------
+    gains : tensor
+        Gain tensor of shape (Npol, Npol, Nants, Ntimes, Nfreqs)
+    g1_idx, g2_idx : tensor
+        len(Nbls) tensor indexing the Nants dimension of gains for
+        each antenna (g1, g2) participating in a given baseline
+    vis_type : str, optional
+        Type of gain tensor, ['com', 'dly']
 
+    Returns
+    -------
+    tensor
+        Baseline gain product of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+    """
+    g1, g2 = _bl_gains(gains, g1_idx, g2_idx)
+    if vis_type == 'com':
+        return g1 * g2.conj()
+    elif vis_type == 'dly':
+        return g1 - g2
     else:
-        assert vis_type == 'com', "must have complex vis_type for 4pol mode"
-        vout = torch.einsum("ab...,bc...,dc...->ad...", g1, vis, g2.conj())
+        raise ValueError("vis_type must be 'com' or 'dly'")
 
-    return vout, cov_out
+
+def apply_gain_product(vis, G, vis_type='com', undo=False):
+    """
+    Apply a 1pol or 2pol baseline gain product
+    (see gain_product()) to visibilities
+
+    Parameters
+    ----------
+    vis : tensor
+        Visibility tensor of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+    G : tensor
+        Baseline gain product of the same shape as vis
+    vis_type : str, optional
+        Type of visibility and gain tensor, ['com', 'dly']
+    undo : bool, optional
+        If True, remove G from vis, otherwise (default) apply it
+
+    Returns
+    -------
+    tensor
+    """
+    if vis_type == 'com':
+        if undo:
+            # divide by G rather than multiply by inverted gains
+            return linalg.diag_div(vis, G)
+        return linalg.diag_matmul(G, vis)
+    elif vis_type == 'dly':
+        return vis - G if undo else vis + G
+    else:
+        raise ValueError("vis_type must be 'com' or 'dly'")
+
+
+def _vis_cal_diag(g1, vis, g2):
+    """
+    Apply diagonal (1pol or 2pol) complex gains to visibilities
+
+    .. math::
+
+        V^{\\rm out}_{12} = g_1 V_{12} g_2^\\ast
+
+    Parameters
+    ----------
+    g1, g2 : tensor
+        Complex gains of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+        already indexed to the baseline ordering of vis
+    vis : tensor
+        Visibilities of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+
+    Returns
+    -------
+    tensor
+    """
+    return linalg.diag_matmul(g1 * g2.conj(), vis)
+
+
+def _vis_uncal_diag(g1, vis, g2):
+    """
+    Remove diagonal (1pol or 2pol) complex gains from visibilities,
+    i.e. the undo counterpart of _vis_cal_diag()
+
+    .. math::
+
+        V^{\\rm out}_{12} = V_{12} / (g_1 g_2^\\ast)
+
+    Parameters
+    ----------
+    g1, g2 : tensor
+        Complex gains of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+        already indexed to the baseline ordering of vis
+    vis : tensor
+        Visibilities of shape (Npol, Npol, Nbls, Ntimes, Nfreqs)
+
+    Returns
+    -------
+    tensor
+    """
+    return linalg.diag_div(vis, g1 * g2.conj())
+
+
+def _vis_cal_1pol(g1, vis, g2):
+    """
+    Apply 1pol complex gains to visibilities, i.e.
+    _vis_cal_diag() without the 1x1 vs 2x2 dispatch
+    """
+    return g1 * vis * g2.conj()
+
+
+def _vis_uncal_1pol(g1, vis, g2):
+    """
+    Remove 1pol complex gains from visibilities, i.e.
+    _vis_uncal_diag() without the 1x1 vs 2x2 dispatch
+    """
+    return vis / (g1 * g2.conj())
+
+
+def _vis_cal_dly(g1, vis, g2):
+    """
+    Apply delay gains to delay visibilities
+    """
+    # subtract g2 inplace from the fresh vis + g1 tensor, rather
+    # than allocate and write a second full-size output
+    return torch.add(vis, g1).sub_(g2)
+
+
+def _vis_uncal_dly(g1, vis, g2):
+    """
+    Remove delay gains from delay visibilities
+    """
+    return torch.sub(vis, g1).add_(g2)
+
+
+# torch.compile'd calibration kernels, keyed by function
+_COMPILED = {}
+
+def _compiled(fn):
+    """
+    Get the torch.compile'd version of a calibration kernel
+    (e.g. _vis_cal_diag), compiling it on first call.
+    Shapes are compiled dynamically so that a change
+    in Nbls, Ntimes or Nfreqs doesn't trigger a recompile.
+    """
+    if fn not in _COMPILED:
+        _COMPILED[fn] = torch.compile(fn, dynamic=True)
+
+    return _COMPILED[fn]
+
+
+def _jones_apply_4pol(g1, vis, g2):
+    """
+    Apply 2x2 Jones matrices to 4pol visibilities
+
+    .. math::
+
+        V^{\\rm out}_{12} = J_1 V_{12} J_2^\\dagger
+
+    Parameters
+    ----------
+    g1, g2 : tensor
+        Jones matrices of shape (2, 2, Nbls, Ntimes, Nfreqs)
+        already indexed to the baseline ordering of vis
+    vis : tensor
+        Visibilities of shape (2, 2, Nbls, Ntimes, Nfreqs)
+
+    Returns
+    -------
+    tensor
+    """
+    # for 2x2 matrices, a batched matmul (which einsum reduces to) moves
+    # the pol axes last and runs tiny GEMMs across all (Nbls, Ntimes, Nfreqs).
+    # Instead, sum over the inner pol index with broadcasted element-wise
+    # products (see linalg.diag_matmul), which stream through the data
+    g2 = g2.conj()
+    # J_1 V: (a, b) x (b, c) -> (a, c)
+    jv = g1[:, :1] * vis[:1] + g1[:, 1:] * vis[1:]
+    # (J_1 V) J_2^dagger: (a, c) x (d, c) -> (a, d)
+    return jv[:, :1] * g2[None, :, 0] + jv[:, 1:] * g2[None, :, 1]
+
+
+# calibration kernels of signature (g1, vis, g2) -> vis,
+# keyed by (polmode, vis_type, undo). Note that 4pol undo
+# first inverts the gains and then applies them as usual
+_CAL_KERNELS = {
+    ('1pol', 'com', False): _vis_cal_1pol,
+    ('1pol', 'com', True): _vis_uncal_1pol,
+    ('2pol', 'com', False): _vis_cal_diag,
+    ('2pol', 'com', True): _vis_uncal_diag,
+    ('1pol', 'dly', False): _vis_cal_dly,
+    ('1pol', 'dly', True): _vis_uncal_dly,
+    ('2pol', 'dly', False): _vis_cal_dly,
+    ('2pol', 'dly', True): _vis_uncal_dly,
+    ('4pol', 'com', False): _jones_apply_4pol,
+}
+
+
+# JonesModels with lazy_refant, whose refant phase is
+# re-fixed on their next forward after any optimizer step
+_LAZY_REFANT_MODELS = weakref.WeakSet()
+
+
+def _invalidate_refant(optimizer, args, kwargs):
+    """torch.optim post-step hook invalidating lazy refant fixes"""
+    for model in _LAZY_REFANT_MODELS:
+        model._refant_fixed = False
+
+
+try:
+    from torch.optim.optimizer import register_optimizer_step_post_hook as _register_step_hook
+    _register_step_hook(_invalidate_refant)
+except ImportError:
+    # without optimizer step hooks, lazy_refant always fixes the refant
+    _register_step_hook = None
 
 
 def rephase_to_refant(params, param_type, refant_idx, p0=None, mode='rephase', inplace=False):
@@ -2304,8 +2904,9 @@ def rephase_to_refant(params, param_type, refant_idx, p0=None, mode='rephase', i
     if refant_idx is None:
         return
 
-    if p0 is None:
-        p0 = torch.zeros_like(params)
+    # note: if p0 is None, it is treated as zeros but never
+    # allocated, so we don't create and rephase a dummy tensor
+    has_p0 = p0 is not None
 
     if not inplace:
         params = copy.deepcopy(params)
@@ -2320,67 +2921,59 @@ def rephase_to_refant(params, param_type, refant_idx, p0=None, mode='rephase', i
             # divide out refant complex phasor
             if not torch.is_complex(params):
                 _p = utils.viewcomp(params)
-                _p0 = utils.viewcomp(p0)
+                if has_p0:
+                    _p0 = utils.viewcomp(p0)
 
             # get refant phasor and divide params by it
-            phs = torch.angle((_p + _p0)[:, :, refant_idx:refant_idx+1]).detach().clone()
-            phasor = torch.exp(1j * phs)
+            ref = _p[:, :, refant_idx:refant_idx+1]
+            if has_p0:
+                ref = ref + _p0[:, :, refant_idx:refant_idx+1]
+            # angle() returns a new tensor, so there is no need to clone
+            phasor = linalg.phasor(torch.angle(ref).detach())
+            # _p and _p0 are (complex views of) params and p0, so these
+            # update them inplace without needing to copy them back
             _p /= phasor
-            _p0 /= phasor
-
-            if not torch.is_complex(params):
-                # recast as view_real
-                _p = utils.viewreal(_p)
-                _p0 = utils.viewreal(_p0)
-
-            params[:] = _p
-            p0[:] = _p0
+            if has_p0:
+                _p0 /= phasor
 
         elif param_type in ['dly', 'phs']:
-            # subtract dly or phs of refant for all antennas
+            # subtract dly or phs of refant for all antennas: the clone
+            # is needed b/c the refant slice overlaps the inplace output
             params -= params[:, :, refant_idx:refant_idx+1].clone()
-            p0 -= p0[:, :, refant_idx:refant_idx+1].clone()
+            if has_p0:
+                p0 -= p0[:, :, refant_idx:refant_idx+1].clone()
 
         elif param_type == 'amp_phs':
             # subtract phs of refant
             params[..., 1] -= params[:, :, refant_idx:refant_idx+1, ..., 1].clone()
-            p0[..., 1] -= p0[:, :, refant_idx:refant_idx+1, ..., 1].clone()
+            if has_p0:
+                p0[..., 1] -= p0[:, :, refant_idx:refant_idx+1, ..., 1].clone()
 
     elif mode == 'zero':
         # just zero-out refant imag component (or dly / phs)
-        if param_type == 'com':
+        for _p in ([params, p0] if has_p0 else [params]):
             # use zeros_like b/c scalar assignment on GPU breaks
-            if not torch.is_complex(params):
-                params[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
-                    params[:, :, refant_idx:refant_idx+1, ..., 1]
+            if param_type == 'com':
+                if not torch.is_complex(_p):
+                    _p[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
+                        _p[:, :, refant_idx:refant_idx+1, ..., 1]
+                    )
+                else:
+                    _p.imag[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
+                        _p.imag[:, :, refant_idx:refant_idx+1]
+                    )
+            elif param_type in ['dly', 'phs']:
+                _p[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
+                    _p[:, :, refant_idx:refant_idx+1]
                 )
-                p0[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
-                    p0[:, :, refant_idx:refant_idx+1, ..., 1]
+            elif param_type == 'amp_phs':
+                _p[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
+                    _p[:, :, refant_idx:refant_idx+1, ..., 1]
                 )
 
-            else:
-                params.imag[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
-                    params.imag[:, :, refant_idx:refant_idx+1]
-                )
-                p0.imag[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
-                    p0.imag[:, :, refant_idx:refant_idx+1]
-                )
-        elif param_type in ['dly', 'phs']:
-            params[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
-                params[:, :, refant_idx:refant_idx+1]
-            )
-            p0[:, :, refant_idx:refant_idx+1] = torch.zeros_like(
-                p0[:, :, refant_idx:refant_idx+1]
-            )
-        elif param_type == 'amp_phs':
-            params[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
-                params[:, :, refant_idx:refant_idx+1, ..., 1]
-            )
-            p0[:, :, refant_idx:refant_idx+1, ..., 1] = torch.zeros_like(
-                p0[:, :, refant_idx:refant_idx+1, ..., 1]
-            )
-
     if not inplace:
+        if not has_p0:
+            p0 = torch.zeros_like(params)
         return params, p0
 
 
@@ -2483,19 +3076,18 @@ def compute_redcal_degen(gains, ants, antpos, wgts=None, abs_amp=True, phs_slope
         (Npol, Npol, 2, Ntimes, Nfreqs) where the two
         elements are the [East, North] gradients respectively
     """
-    # get weights
-    if wgts is None:
-        w = 1.
-        wsum = 1.
-    else:
-        w = wgts[:, None, None]
-        wsum = torch.sum(wgts)
-
     # compute absolute amplitude parameter: average abs of squared gains
     abs_amp_param = None
     if abs_amp:
-        abs_amp_param = torch.sum(torch.abs(gains)**2 * w, dim=2, keepdims=True) / wsum
-        abs_amp_param = torch.log(torch.sqrt(abs_amp_param))
+        if wgts is None:
+            # the 2-norm over antennas reads gains once in a single reduction
+            abs_amp_param = torch.log(torch.linalg.vector_norm(gains, dim=2, keepdim=True))
+        else:
+            # |g|^2 directly, rather than squaring a sqrt from abs(),
+            # and contract wgts without forming the weighted tensor
+            g2 = gains.real**2 + gains.imag**2 if torch.is_complex(gains) else gains**2
+            abs_amp_param = torch.einsum("b,ijblm->ijlm", wgts, g2)[:, :, None]
+            abs_amp_param = 0.5 * torch.log(abs_amp_param / torch.sum(wgts))
 
     ### LEGACY
     #eta = torch.log(torch.abs(gains))
@@ -2505,17 +3097,58 @@ def compute_redcal_degen(gains, ants, antpos, wgts=None, abs_amp=True, phs_slope
     phs_slope_param = None
     if phs_slope:
         gain_phs = torch.angle(gains)
-        A = antpos[[a for a in ants]][:, :2]
-        if wgts is None:
-            AtWAinvAtW = torch.pinverse(A.T @ A) @ A.T
-        else:
-            W = torch.eye(len(ants), device=gains.device) * wgts / wsum
-            AtWAinvAtW = torch.pinverse(A.T @ W @ A) @ A.T @ W
+        A = _antpos_xy(antpos, ants)
+        AtWAinvAtW = _degen_slope_operator(A, wgts=wgts)
         phs_slope_param = torch.einsum("ab,ijblm->ijalm", AtWAinvAtW, gain_phs)
 
     return abs_amp_param, phs_slope_param
 
 
+def _antpos_xy(antpos, ants=None):
+    """
+    Get the (Nants, 2) [East, North] antenna positions for ants
+    (default all antennas in antpos). For an AntposDict this is
+    a view of its antvecs whenever ants matches antpos.ants.
+    """
+    if isinstance(antpos, utils.AntposDict):
+        return antpos.get_antvecs(ants)[:, :2]
+    ants = list(antpos) if ants is None else ants
+    return torch.as_tensor(np.array([antpos[a] for a in ants]))[:, :2]
+
+
+def _degen_slope_operator(A, wgts=None):
+    """
+    Get the weighted least-squares operator (A^T W A)^+ A^T W
+    for the phase slope redcal degeneracy, where W = diag(wgts).
+    Note the normalization of wgts cancels out. The pseudo-inverse
+    gives the minimum-norm slope if A is (nearly) rank deficient,
+    e.g. for a linear array or EW-only baselines.
+
+    Parameters
+    ----------
+    A : tensor
+        (N, 2) tensor of [East, North] antenna
+        (or baseline) vectors [meters]
+    wgts : tensor, optional
+        1D weights of length N. Default is uniform weights.
+
+    Returns
+    -------
+    tensor
+        Operator of shape (2, N)
+    """
+    # apply diagonal W by broadcasting, rather than a dense (N, N) matmul
+    AtW = A.T if wgts is None else A.T * wgts
+    AtWA = AtW @ A
+    # AtWA is a symmetric 2x2 matrix, so its pseudo-inverse is a cheap
+    # eigendecomposition. Truncate eigenvalues below the rounding error
+    # of forming AtWA, such that a nearly singular system (e.g. collinear
+    # antennas with float noise in their perpendicular offsets) yields
+    # the minimum-norm slope rather than a blown-up solve
+    rtol = A.shape[0] * torch.finfo(AtWA.dtype).eps
+    return torch.linalg.pinv(AtWA, rtol=rtol, hermitian=True) @ AtW
+
+
 def redcal_degen_gains(abs_amp=None, phs_slope=None, ants=None, antpos=None):
     """
     Given redcal degenerate parameters, transform to their complex gains
@@ -2540,25 +3173,33 @@ def redcal_degen_gains(abs_amp=None, phs_slope=None, ants=None, antpos=None):
     tensor
         Complex gains of shape (Npol, Npol, Nant, Ntimes, Nfreqs)
     """
-    # fill unit gains
-    device = None
+    # unit gains if there are no degenerate parameters
+    if abs_amp is None and phs_slope is None:
+        return torch.ones(1, 1, 1, 1, 1, dtype=utils._cfloat())
+
+    # gains are complex with at least the default precision, and
+    # polar() needs amp and phs in the same real dtype
+    dtype = utils._float()
+    for p in [abs_amp, phs_slope]:
+        if p is not None:
+            dtype = torch.promote_types(dtype, p.dtype)
+
+    # absolute amplitude, broadcasted to 5D gains
+    amp = None
     if abs_amp is not None:
-        device = abs_amp.device
-    elif phs_slope is not None:
-        device = phs_slope.device
-    gains = torch.ones(1, 1, 1, 1, 1, dtype=utils._cfloat(), device=device)
+        amp = torch.exp(abs_amp.to(dtype))
+        amp = amp.reshape((1,) * (5 - amp.ndim) + amp.shape)
 
-    # incorporate absolute amplitude
-    if abs_amp is not None:
-        gains = gains * torch.exp(abs_amp)
+    # phase slope
+    if phs_slope is None:
+        return amp.to(torch.promote_types(dtype, utils._cfloat()))
+    A = _antpos_xy(antpos).to(dtype)
+    phs = (phs_slope.to(dtype).moveaxis(2, -1) @ A.T).moveaxis(-1, 2)
+    if amp is None:
+        return linalg.phasor(phs)
 
-    # incorporate phase slope
-    if phs_slope is not None:
-        A = antpos[[a for a in antpos]][:, :2]
-        phs = (phs_slope.moveaxis(2, -1) @ A.T).moveaxis(-1, 2)
-        gains = gains * torch.exp(1j * phs)
-
-    return gains
+    # form amp * exp(i phs) in a single complex kernel
+    return torch.polar(amp, phs)
 
 
 def compute_redcal_degen_vis(vd, wgts=None, abs_amp=True, phs_slope=True,
@@ -2616,11 +3257,7 @@ def compute_redcal_degen_vis(vd, wgts=None, abs_amp=True, phs_slope=True,
         antpos = vd.antpos if isinstance(vd, dataset.VisData) else antpos
         ant1, ant2 = zip(*bls)
         A = (antpos[ant1] - antpos[ant2])[:, :2]
-        if wgts is None:
-            AtWAinvAtW = torch.pinverse(A.T @ A) @ A.T
-        else:
-            W = torch.eye(Nants, device=gains.device) * wgts / wsum
-            AtWAinvAtW = torch.pinverse(A.T @ W @ A) @ A.T @ W
+        AtWAinvAtW = _degen_slope_operator(A, wgts=wgts)
         phs_slope_param = torch.einsum("ab,ijblm->ijalm", AtWAinvAtW, vis_phs)
 
     return abs_amp_param, phs_slope_param
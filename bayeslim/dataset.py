@@ -136,7 +136,7 @@ class TensorData:
         from bayeslim import optim
         self.icov = optim.compute_icov(self.cov, self.cov_axis, inv=inv, **kwargs)
 
-    def copy(self, deepcopy=False, detach=True):
+    def copy(self, deepcopy=False, detach=True, copydata=True):
         """
         Copy and return self. This is equivalent
         to a detach and clone. Detach is optional
@@ -148,6 +148,10 @@ class TensorData:
             in addition to data.
         detach : bool, optional
             If True (default) detach self.data for new object
+        copydata : bool, optional
+            If True (default) clone self.data for the new object,
+            otherwise the new object's data points to self.data.
+            Useful if the new object's data is about to be replaced.
         """
         flags, cov, icov = self.flags, self.cov, self.icov
         history = self.history
@@ -157,7 +161,8 @@ class TensorData:
         if data is not None:
             if detach:
                 data = data.detach()
-            data = data.clone()
+            if copydata:
+                data = data.clone()
 
         if deepcopy:
             if flags is not None: flags = flags.clone()
@@ -171,11 +176,11 @@ class TensorData:
         return td
 
     def __add__(self, other):
-        out = self.copy()
+        out = self.copy(copydata=False)
         if isinstance(other, (float, int, complex, torch.Tensor)):
-            out.data += other
+            out.data = out.data + other
         else:
-            out.data += other.data
+            out.data = out.data + other.data
             self._propflags(out, other)
         return out
 
@@ -188,11 +193,11 @@ class TensorData:
         return self
 
     def __sub__(self, other):
-        out = self.copy()
+        out = self.copy(copydata=False)
         if isinstance(other, (float, int, complex, torch.Tensor)):
-            out.data -= other
+            out.data = out.data - other
         else:
-            out.data -= other.data
+            out.data = out.data - other.data
             self._propflags(out, other)
         return out
 
@@ -205,11 +210,11 @@ class TensorData:
         return self
 
     def __mul__(self, other):
-        out = self.copy()
+        out = self.copy(copydata=False)
         if isinstance(other, (float, int, complex, torch.Tensor)):
-            out.data *= other
+            out.data = out.data * other
         else:
-            out.data *= other.data
+            out.data = out.data * other.data
             self._propflags(out, other)
         return out
 
@@ -222,11 +227,11 @@ class TensorData:
         return self
 
     def __truediv__(self, other):
-        out = self.copy()
+        out = self.copy(copydata=False)
         if isinstance(other, (float, int, complex, torch.Tensor)):
-            out.data /= other
+            out.data = out.data / other
         else:
-            out.data /= other.data
+            out.data = out.data / other.data
             self._propflags(out, other)
         return out
 
@@ -514,7 +519,7 @@ class VisData(TensorData):
 
         return self.antpos[ant2] - self.antpos[ant1]
 
-    def copy(self, deepcopy=False, detach=True):
+    def copy(self, deepcopy=False, detach=True, copydata=True):
         """
         Copy and return self. This is equivalent
         to a detach and clone. Detach is optional
@@ -529,6 +534,10 @@ class VisData(TensorData):
             of data and make all other (meta)data a pointer to self.
         detach : bool, optional
             If True (default) detach self.data for new object
+        copydata : bool, optional
+            If True (default) clone self.data for the new object,
+            otherwise the new object's data points to self.data.
+            Useful if the new object's data is about to be replaced.
         """
         vd = VisData()
         telescope, antpos = self.telescope, self.antpos
@@ -541,7 +550,8 @@ class VisData(TensorData):
         if data is not None:
             if detach:
                 data = data.detach()
-            data = data.clone()
+            if copydata:
+                data = data.clone()
 
         if deepcopy:
             if telescope is not None:
@@ -1763,15 +1773,26 @@ class MapData(TensorData):
         self.set_cov(cov, cov_axis, icov=icov)
         self.history = history
 
-    def copy(self, detach=True):
+    def copy(self, detach=True, copydata=True):
         """
         Copy and return self. This is equivalent
         to a detach and clone. Detach is optional
+
+        Parameters
+        ----------
+        detach : bool, optional
+            If True (default) detach self.data for new object
+        copydata : bool, optional
+            If True (default) clone self.data for the new object,
+            otherwise the new object's data points to self.data.
+            Useful if the new object's data is about to be replaced.
         """
         md = MapData()
         md.setup_meta(name=self.name)
         data = self.data.detach() if detach else self.data
-        md.setup_data(self.freqs, df=self.df, pols=self.pols, data=data.clone(), norm=self.norm,
+        if copydata:
+            data = data.clone()
+        md.setup_data(self.freqs, df=self.df, pols=self.pols, data=data, norm=self.norm,
                       angs=self.angs, flags=self.flags, cov=self.cov,
                       icov=self.icov, cov_axis=self.cov_axis, history=self.history)
         return md
@@ -2361,7 +2382,7 @@ class CalData(TensorData):
         self.set_cov(cov, cov_axis, icov=icov)
         self.history = history
 
-    def copy(self, deepcopy=False, detach=True):
+    def copy(self, deepcopy=False, detach=True, copydata=True):
         """
         Copy and return self. This is equivalent
         to a detach and clone. Detach is optional
@@ -2376,6 +2397,10 @@ class CalData(TensorData):
             of data and make all other (meta)data a pointer to self.
         detach : bool, optional
             If True (default) detach self.data for new object
+        copydata : bool, optional
+            If True (default) clone self.data for the new object,
+            otherwise the new object's data points to self.data.
+            Useful if the new object's data is about to be replaced.
         """
         cd = CalData()
         telescope, antpos = self.telescope, self.antpos
@@ -2388,7 +2413,8 @@ class CalData(TensorData):
         if data is not None:
             if detach:
                 data = data.detach()
-            data = data.clone()
+            if copydata:
+                data = data.clone()
 
         if deepcopy:
             if telescope is not None:
@@ -14,7 +14,7 @@ class FFT(utils.Module):
     """
     def __init__(self, dim=0, abs=False, peaknorm=False, N=None, dx=None,
                  ndim=None, window=None, fftshift=True, ifft=False, norm=None,
-                 edgecut=None, square=False, device=None, **kwargs):
+                 edgecut=None, square=False, rfft=False, device=None, **kwargs):
         """
         Parameters
         ----------
@@ -50,6 +50,12 @@ class FFT(utils.Module):
             to edge channels).
         square : bool, optional
             If True, take abs(fft)**2 before output
+        rfft : bool, optional
+            If True, use the real-input FFT (torch.fft.rfft), which
+            only returns the N//2 + 1 non-negative Fourier modes
+            at half the cost of the full FFT. Input must be real,
+            and fftshift is not applied. Only applies to the
+            forward (not inverse) FFT.
         kwargs : dict, optional
             Kwargs to pass to gen_window()
         """
@@ -62,10 +68,15 @@ class FFT(utils.Module):
         self.ifft = ifft
         self.norm = norm
         self.square = square
+        self.rfft = rfft
+        self.N = N
         if N is not None:
-            self.freqs = torch.fft.fftfreq(N, d=self.dx)
-            if fftshift:
-                self.freqs = torch.fft.fftshift(self.freqs)
+            if rfft:
+                self.freqs = torch.fft.rfftfreq(N, d=self.dx)
+            else:
+                self.freqs = torch.fft.fftfreq(N, d=self.dx)
+                if fftshift:
+                    self.freqs = torch.fft.fftshift(self.freqs)
             self.start = self.freqs[0]
             self.df = self.freqs[1] - self.freqs[0]
         else:
@@ -92,39 +103,58 @@ class FFT(utils.Module):
         if device is not None:
             self.push(device)
 
-    def forward(self, inp, ifft=None, **kwargs):
+    def forward(self, inp, ifft=None, dim=None, **kwargs):
         """
         Take the FFT of the inp and return
+
+        Parameters
+        ----------
+        inp : tensor, ndarray, VisData, CalData or MapData
+            Input to FFT
+        ifft : bool, optional
+            Use the ifft instead of fft, default is self.ifft
+        dim : int, optional
+            Take the FFT along this dim instead of self.dim.
+            If using a window, it is moved from self.dim to dim.
         """
         if isinstance(inp, np.ndarray):
             inp = torch.as_tensor(inp)
 
         elif isinstance(inp, (dataset.VisData, dataset.CalData, dataset.MapData)):
-            out = inp.copy()
-            out.data = self.forward(inp.data, **kwargs)
+            out = inp.copy(copydata=False)
+            out.data = self.forward(inp.data, ifft=ifft, dim=dim, **kwargs)
             return out
 
+        dim = dim if dim is not None else self.dim
+
         if self.win is not None:
-            inp = inp * self.win
+            inp = inp * self.win.moveaxis(self.dim, dim)
 
         ifft = ifft if ifft is not None else self.ifft
 
         if self.fftshift and ifft:
-            inp = torch.fft.ifftshift(inp, dim=self.dim)
+            inp = torch.fft.ifftshift(inp, dim=dim)
+
+        rfft = getattr(self, 'rfft', False) and not ifft
 
         if ifft:
-            inp_fft = torch.fft.ifft(inp, norm=self.norm, dim=self.dim)
+            inp_fft = torch.fft.ifft(inp, norm=self.norm, dim=dim)
+        elif rfft:
+            inp_fft = torch.fft.rfft(inp, norm=self.norm, dim=dim)
         else:
-            inp_fft = torch.fft.fft(inp, norm=self.norm, dim=self.dim)
+            inp_fft = torch.fft.fft(inp, norm=self.norm, dim=dim)
 
-        if self.fftshift and not ifft:
-            inp_fft = torch.fft.fftshift(inp_fft, dim=self.dim)
+        if self.fftshift and not ifft and not rfft:
+            inp_fft = torch.fft.fftshift(inp_fft, dim=dim)
 
         if self.abs:
             inp_fft = torch.abs(inp_fft)
 
         if self.peaknorm:
-            inp_fft = inp_fft / torch.max(torch.abs(inp_fft), dim=self.dim, keepdim=True).values
+            # amax is a single reduction (no argmax indices), and
+            # if we've already taken the abs we don't need to redo it
+            peak = inp_fft if self.abs else torch.abs(inp_fft)
+            inp_fft = inp_fft / peak.amax(dim=dim, keepdim=True)
 
         if self.square:
             inp_fft = torch.abs(inp_fft)**2
@@ -135,7 +165,38 @@ class FFT(utils.Module):
         """
         Push self to device
         """
-        self.win = self.win.to(device)
+        self.win = utils.push(self.win, device)
+        self.freqs = utils.push(self.freqs, device)
+        self.start = utils.push(self.start, device)
+        self.df = utils.push(self.df, device)
+
+
+@torch.jit.script
+def _quinn_k(x):
+    """
+    Quinn's k() function for the 2nd estimator
+    """
+    # TorchScript can't close over module-level floats,
+    # so sqrt(6) / 24 and sqrt(2 / 3) are written as literals
+    x1 = x + 1
+    return 0.25 * torch.log(3 * x * x + 6 * x + 1) \
+            - 0.10206207261596574 * torch.log((x1 - 0.816496580927726) / (x1 + 0.816496580927726))
+
+
+@torch.jit.script
+def _quinn_offset(rpos, rneg):
+    """
+    Quinn's 2nd estimator for the offset of the peak from
+    the argmax bin, given the (real) ratio of the positive and
+    negative neighboring bins to the argmax bin. This is scripted
+    such that its pointwise ops can be fused into a single kernel.
+    """
+    # operate inplace on fresh temporaries where possible to reduce
+    # allocations when the ops are not fused (e.g. on cpu)
+    dpos = (rpos / (1 - rpos)).neg_()
+    dneg = rneg / (1 - rneg)
+    offset = (dneg + dpos).mul_(0.5)
+    return offset.add_(_quinn_k(dneg * dneg)).sub_(_quinn_k(dpos * dpos))
 
 
 class PeakDelay(FFT):
@@ -143,56 +204,163 @@ class PeakDelay(FFT):
     Compute peak delay across dim, using
     Quinn's 2nd estimator
     """
-    def __init__(self, **kwargs):
+    def __init__(self, compile_peak=False, compile_kwargs=None, **kwargs):
+        """
+        Parameters
+        ----------
+        compile_peak : bool, optional
+            If True, compile the FFT and peak estimation
+            with torch.compile. A separate graph is compiled
+            (and cached) for each input shape, dtype and device.
+        compile_kwargs : dict, optional
+            Keyword arguments for torch.compile.
+            Default is dict(dynamic=False).
+        kwargs : dict
+            Keyword arguments for FFT
+        """
         super().__init__(**kwargs)
+        self.compile_peak = compile_peak
+        self.compile_kwargs = compile_kwargs if compile_kwargs is not None else dict(dynamic=False)
+        self.clear_compile_cache()
+        self._bin_cache = {}
+        # use the scripted estimator unless k() is overridden by a subclass
+        self._script_k = type(self).k is PeakDelay.k
+
+    def clear_compile_cache(self):
+        """
+        Clear cache of compiled forward functions
+        """
+        self._compiled = {}
 
     def k(self, x):
-        return 0.25 * torch.log(3 * x**2 + 6 * x + 1) \
-                - np.sqrt(6) / 24 \
-                * torch.log((x + 1 - np.sqrt(2./3.)) / (x + 1 + np.sqrt(2./3.)))
+        return _quinn_k(x)
 
-    def get_peak(self, y):
+    def _bins(self, start, stop, device):
         """
-        Use Quinn 2nd estimator to get peak ybin
+        Get cached torch.arange(start, stop) integer
+        bin offsets on device
+        """
+        key = (start, stop, device)
+        bins = self._bin_cache.get(key)
+        if bins is None:
+            bins = torch.arange(start, stop, device=device)
+            self._bin_cache[key] = bins
+        return bins
+
+    def offset(self, rpos, rneg):
+        """
+        Quinn's 2nd estimator for the offset of the peak
+        from the argmax bin, using self.k()
+
+        Parameters
+        ----------
+        rpos, rneg : tensor
+            Real ratio of the positive and negative
+            neighboring bins to the argmax bin
+
+        Returns
+        -------
+        tensor
         """
-        argmax = torch.argmax(torch.abs(y))
-        argmax_pos = argmax + 1 if argmax != len(y) - 1 else 0
-        argmax_neg = argmax - 1 if argmax != 0 else -1
-        cast = torch.real if torch.is_complex(y) else torch.as_tensor
-        rpos = cast(y[argmax_pos] / y[argmax])
-        rneg = cast(y[argmax_neg] / y[argmax])
+        if getattr(self, '_script_k', False):
+            # k() is inlined in the scripted function
+            return _quinn_offset(rpos, rneg)
         dpos = -rpos / (1 - rpos)
         dneg = rneg / (1 - rneg)
-        max_bin = argmax + ((dneg + dpos) / 2 + self.k(dneg**2) - self.k(dpos**2))
+        return (dneg + dpos) / 2 + self.k(dneg * dneg) - self.k(dpos * dpos)
 
-        return self.start + max_bin * self.df
+    def get_peak(self, y, n=None):
+        """
+        Use Quinn 2nd estimator to get peak ybin
+        along the last dim of y
 
-    def _iter_peak(self, inp, dim, out):
-        if inp.ndim == 1:
-            # estimate peak
-            out[:] = self.get_peak(inp)
+        Parameters
+        ----------
+        y : tensor
+            Fourier tensor of shape (..., N)
+        n : int, optional
+            Length of the input to the real-input FFT, if rfft.
+            Default is self.N if set, otherwise 2 * (N - 1),
+            i.e. an even length.
+
+        Returns
+        -------
+        tensor
+            Peak location of shape (...)
+        """
+        N = y.shape[-1]
+        is_complex = torch.is_complex(y)
+        if is_complex:
+            # argmax of |y|^2 is that of |y|, but avoids the sqrt
+            mag = y.real.square().add_(y.imag.square())
         else:
-            # iterate
-            for i in range(len(inp)):
-                self._iter_peak(inp[i], dim+1, out[i])
+            mag = torch.abs(y)
+        argmax = torch.argmax(mag, dim=-1, keepdim=True)
+        # gather (negative, argmax, positive) bins in one pass
+        idx = argmax + self._bins(-1, 2, y.device)
+        rfft = getattr(self, 'rfft', False)
+        if rfft:
+            # reflect about the edges of the half-spectrum, where bin -k
+            # (or n - k) is the conjugate of bin k. note for odd n,
+            # the neighbor of the last bin is its own conjugate
+            if n is None:
+                n = getattr(self, 'N', None) or 2 * (N - 1)
+            k = idx.abs()
+            reflect = (idx < 0) | (n - k < k)
+            idx = torch.minimum(k, n - k)
+        else:
+            # wrap-around at the edges
+            idx = idx % N
+        y3 = y.gather(-1, idx)
+        if rfft and is_complex:
+            y3 = torch.where(reflect, y3.conj(), y3)
+        r = y3 / y3[..., 1:2]
+        if is_complex:
+            r = r.real
+        rneg, rpos = r[..., 0], r[..., 2]
+        # add the integer argmax into the float offset in place,
+        # rather than promoting it to a new float tensor
+        max_bin = self.offset(rpos, rneg).add_(argmax[..., 0])
+
+        # map bin to start + max_bin * df in a single kernel
+        return torch.addcmul(torch.as_tensor(self.start, device=max_bin.device),
+                             max_bin, torch.as_tensor(self.df, device=max_bin.device))
 
     def forward(self, inp):
 
         if isinstance(inp, (dataset.VisData, dataset.MapData)):
-            out = inp.copy()
+            out = inp.copy(copydata=False)
             out.data = self.forward(inp.data)
             return out
 
-        # take fft
-        inp = super().forward(inp)
+        if isinstance(inp, np.ndarray):
+            inp = torch.as_tensor(inp)
+
+        if self.compile_peak:
+            # specialize the compiled graph on input shape
+            key = (tuple(inp.shape), inp.dtype, inp.device)
+            if key not in self._compiled:
+                self._compiled[key] = torch.compile(self._forward, **self.compile_kwargs)
+            return self._compiled[key](inp)
+
+        return self._forward(inp)
 
-        # iterate over all dims
-        shape = list(inp.shape)
-        shape[self.dim] = 1
-        out = torch.zeros(shape, dtype=utils._float())
-        out = out.moveaxis(self.dim, -1)
-        self._iter_peak(inp, 0, out)
-        out = out.moveaxis(-1, self.dim)
+    def _forward(self, inp):
+        """
+        Take the FFT of inp and estimate its peak along dim
+        """
+        # take fft along the last dim, which batches
+        # all 1D slices into a single last-dim transform
+        if self.dim % inp.ndim != inp.ndim - 1:
+            # make the transposed tensor contiguous up front, so the
+            # fft and the peak search read along contiguous rows
+            inp = inp.moveaxis(self.dim, -1).contiguous()
+        n = inp.shape[-1]
+        inp = super().forward(inp, dim=-1)
+
+        # estimate peak of all 1D slices at once: the leading dims
+        # keep their order, so just insert the reduced dim back in
+        out = self.get_peak(inp, n=n).unsqueeze(self.dim)
 
         return out
 
@@ -93,7 +93,7 @@ class MatFilter(BaseFilter):
         tensor or dataset
         """
         if isinstance(y, dataset.TensorData):
-            out = y.copy()
+            out = y.copy(copydata=False)
             out.data = self.predict(out.data)
             return out
 
@@ -124,7 +124,7 @@ class MatFilter(BaseFilter):
             y = torch.as_tensor(y)
 
         elif isinstance(y, dataset.TensorData):
-            out = y.copy()
+            out = y.copy(copydata=False)
             out.data = self.forward(y.data, **kwargs)
             return out
 
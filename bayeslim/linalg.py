@@ -17,15 +17,18 @@ def cmult(a, b):
     Parameters
     ----------
     a : tensor
-        In 2-real form
+        In 2-real form, or complex
     b : tensor
-        In 2-real form
+        In 2-real form, or complex
 
     Returns
     -------
     tensor
-        Complex product of a and b in 2-real form
+        Complex product of a and b in 2-real form,
+        or complex if a and b are complex
     """
+    if torch.is_complex(a):
+        return a * b
     return viewreal(viewcomp(a) * viewcomp(b))
 
 
@@ -39,15 +42,18 @@ def cdiv(a, b):
     Parameters
     ----------
     a : tensor
-        In 2-real form
+        In 2-real form, or complex
     b : tensor
-        In 2-real form
+        In 2-real form, or complex
 
     Returns
     -------
     tensor
-        Complex division of a / b in 2-real form
+        Complex division of a / b in 2-real form,
+        or complex if a and b are complex
     """
+    if torch.is_complex(a):
+        return a / b
     return viewreal(viewcomp(a) / viewcomp(b))
 
 
@@ -61,13 +67,16 @@ def cconj(z):
     Parameters
     ----------
     z : tensor
-        In 2-real form
+        In 2-real form, or complex
 
     Returns
     -------
     tensor
-        Complex conjugate of z in 2-real form
+        Complex conjugate of z in 2-real form,
+        or complex if z is complex
     """
+    if torch.is_complex(z):
+        return z.conj()
     return viewreal(viewcomp(z).conj())
 
 
@@ -103,14 +112,26 @@ def cinv(z):
     Parameters
     ----------
     z : tensor
-        torch tensor in 2-real form
+        torch tensor in 2-real form, or complex
+        (in which case the last two axes are inverted)
 
     Returns
     -------
     tensor
-        inverse of z in 2-real form
-    """
-    return viewreal(torch.inverse(viewcomp(z)))
+        inverse of z in 2-real form,
+        or complex if z is complex
+    """
+    is_complex = torch.is_complex(z)
+    if not is_complex:
+        # view_as_complex needs a unit stride on the 2-real axis
+        z = viewcomp(z.contiguous())
+    if z.shape[-1] == z.shape[-2] and z.shape[-1] <= 2:
+        # 1x1 and 2x2: invert analytically rather than with LAPACK
+        zinv = mat_inv(z.movedim((-2, -1), (0, 1))).movedim((0, 1), (-2, -1))
+    else:
+        zinv = torch.linalg.inv(z)
+
+    return zinv if is_complex else viewreal(zinv)
 
 
 def diag_matmul(a, b):
@@ -140,11 +161,10 @@ def diag_matmul(a, b):
         # 1x1: trivial
         return a * b
     elif a.shape[0] == 2:
-        # 2x2
-        c = torch.zeros_like(a)
-        c[0, 0] = a[0, 0] * b[0, 0]
-        c[1, 1] = a[1, 1] * b[1, 1]
-        return c
+        # 2x2: multiply the diagonals (moved to the last dim)
+        # and embed them back into the leading dims
+        d = a.diagonal(dim1=0, dim2=1) * b.diagonal(dim1=0, dim2=1)
+        return torch.diag_embed(d, dim1=0, dim2=1)
     else:
         raise ValueError("only 1x1 or 2x2 tensors")
 
@@ -169,14 +189,69 @@ def diag_inv(a):
         # 1x1: trivial
         return 1 / a
     elif a.shape[0] == 2:
-        # 2x2
-        c = torch.zeros_like(a)
-        c[0, 0] = 1 / a[0, 0]
-        c[1, 1] = 1 / a[1, 1]
-        return c
+        # 2x2: invert the diagonal (moved to the last dim)
+        # and embed it back into the leading dims
+        return torch.diag_embed(1 / a.diagonal(dim1=0, dim2=1), dim1=0, dim2=1)
+    else:
+        raise ValueError("only 1x1 or 2x2 tensors")
+
+def diag_div(a, b):
+    """
+    Divide two diagonal 1x1 or 2x2 matrices manually,
+    i.e. a @ inv(b) for diagonal a and b. This avoids
+    inverting b in a separate pass (see diag_inv).
+    This drops the off-diagonal components of a and b.
+
+    Parameters
+    ----------
+    a, b : tensor
+        of shape (Nax, Nax, ...), where Nax = 1 or 2
+
+    Returns
+    -------
+    c : tensor
+        of shape (Nax, Nax, ...)
+    """
+    if a.shape[0] == 1:
+        # 1x1: trivial
+        return a / b
+    elif a.shape[0] == 2:
+        # 2x2: divide the diagonals (moved to the last dim)
+        # and embed them back into the leading dims
+        d = a.diagonal(dim1=0, dim2=1) / b.diagonal(dim1=0, dim2=1)
+        return torch.diag_embed(d, dim1=0, dim2=1)
+    else:
+        raise ValueError("only 1x1 or 2x2 tensors")
+
+
+def mat_inv(a):
+    """
+    Invert a full 1x1 or 2x2 matrix analytically,
+    batched over all trailing dimensions. Unlike
+    diag_inv, this keeps the off-diagonal terms.
+
+    Parameters
+    ----------
+    a : tensor
+        of shape (Nax, Nax, ...), where Nax = 1 or 2
+
+    Returns
+    -------
+    c : tensor
+        of shape (Nax, Nax, ...)
+    """
+    if a.shape[0] == 1:
+        # 1x1: trivial
+        return 1 / a
+    elif a.shape[0] == 2:
+        # 2x2: [[d, -b], [-c, a]] / (ad - bc)
+        det = a[0, 0] * a[1, 1] - a[0, 1] * a[1, 0]
+        return torch.stack([torch.stack([a[1, 1], -a[0, 1]]),
+                            torch.stack([-a[1, 0], a[0, 0]])]) / det
     else:
         raise ValueError("only 1x1 or 2x2 tensors")
 
+
 def angle(z):
     """
     Compute phase of the 2-real tensor z
@@ -217,6 +292,25 @@ def abs(z):
     return zabs
 
 
+def phasor(phi):
+    """
+    Compute exp(1j * phi) for a real-valued phase tensor
+    using torch.polar, which avoids forming the
+    intermediate complex tensor 1j * phi
+
+    Parameters
+    ----------
+    phi : tensor
+        Real-valued phase in radians
+
+    Returns
+    -------
+    tensor
+        Complex phasor of phi.shape
+    """
+    return torch.polar(torch.ones((), dtype=phi.dtype, device=phi.device), phi)
+
+
 def apply_phasor(z, phi):
     """
     Apply a complex phasor to z
@@ -297,69 +391,42 @@ def cmatmul(a, b):
     """
     Perform 1x1 or 2x2 matrix multiplication
     along the first two axes of a and b
-    in 2-real form. Note: this is slow
-    compared to torch.einsum, but doesn't need
-    to cast to complex
+    in 2-real form. This operates on complex
+    views of a and b, copying them only if
+    they are not contiguous.
 
     Parameters
     -----------
     a : tensor
-        In 2-real form with shape of b
+        In 2-real form (or complex) with shape of b
     b : tensor
-        In 2-real form with shape of a
+        In 2-real form (or complex) with shape of a
 
     Returns
     -------
     tensor
         Matrix multiplication of a and b along
-        their 0th and 1st axes
+        their 0th and 1st axes, complex if a
+        and b are complex
     """
     # determine if 1x1 or 2x2 matmul
     assert b.shape[0] == b.shape[1] == a.shape[0] == a.shape[1]
     assert a.shape[0] in [1, 2]
     twodim = True if a.shape[0] == 2 else False
+    if not torch.is_complex(a):
+        # view_as_complex needs a unit stride on the 2-real axis
+        a, b = a.contiguous(), b.contiguous()
 
     if not twodim:
         # 1x1 matmul is trivial
         return cmult(a, b)
     else:
-        # 2x2 matmul
-        c = torch.zeros_like(a)
-
-        # upper left real
-        c[0, 0, ..., 0] = a[0, 0, ..., 0] * b[0, 0, ..., 0] - a[0, 0, ..., 1] * b[0, 0, ..., 1] \
-                          + a[0, 1, ..., 0] * b[1, 0, ..., 0] - a[0, 1, ..., 1] * b[1, 0, ..., 1]
-
-        # upper left imag
-        c[0, 0, ..., 1] = a[0, 0, ..., 0] * b[0, 0, ..., 1] + a[0, 0, ..., 1] * b[0, 0, ..., 0] \
-                          + a[0, 1, ..., 0] * b[1, 0, ..., 1] + a[0, 1, ..., 1] * b[1, 0, ..., 0]
-
-        # upper right real
-        c[0, 1, ..., 0] = a[0, 0, ..., 0] * b[0, 1, ..., 0] - a[0, 0, ..., 1] * b[0, 1, ..., 1] \
-                          + a[0, 1, ..., 0] * b[1, 1, ..., 0] - a[0, 1, ..., 1] * b[1, 1, ..., 1]
-
-        # upper right imag
-        c[0, 1, ..., 1] = a[0, 0, ..., 0] * b[0, 1, ..., 1] + a[0, 0, ..., 1] * b[0, 1, ..., 0] \
-                          + a[0, 1, ..., 0] * b[1, 1, ..., 1] + a[0, 1, ..., 1] * b[1, 1, ..., 0]
-
-        # lower left real
-        c[1, 0, ..., 0] = a[1, 0, ..., 0] * b[0, 0, ..., 0] - a[1, 0, ..., 1] * b[0, 0, ..., 1] \
-                          + a[1, 1, ..., 0] * b[1, 0, ..., 0] - a[1, 1, ..., 1] * b[1, 0, ..., 1]
-
-        # lower left imag
-        c[1, 0, ..., 1] = a[1, 0, ..., 0] * b[0, 0, ..., 1] + a[1, 0, ..., 1] * b[0, 0, ..., 0] \
-                          + a[1, 1, ..., 0] * b[1, 0, ..., 1] + a[1, 1, ..., 1] * b[1, 0, ..., 0]
-
-        # lower right real
-        c[1, 1, ..., 0] = a[1, 0, ..., 0] * b[0, 1, ..., 0] - a[1, 0, ..., 1] * b[0, 1, ..., 1] \
-                          + a[1, 1, ..., 0] * b[1, 1, ..., 0] - a[1, 1, ..., 1] * b[1, 1, ..., 1]
-
-        # lower right imag
-        c[1, 1, ..., 1] = a[1, 0, ..., 0] * b[0, 1, ..., 1] + a[1, 0, ..., 1] * b[0, 1, ..., 0] \
-                          + a[1, 1, ..., 0] * b[1, 1, ..., 1] + a[1, 1, ..., 1] * b[1, 1, ..., 0]
-
-
-    return c
+        # 2x2 matmul: sum over the inner index with broadcasted
+        # complex products, i.e. (i, k) x (k, j) -> (i, j)
+        if torch.is_complex(a):
+            return a[:, :1] * b[:1] + a[:, 1:] * b[1:]
+        a, b = viewcomp(a), viewcomp(b)
+        return viewreal(a[:, :1] * b[:1] + a[:, 1:] * b[1:])
 
 
 def cholesky_inverse(A, check_errors=True):
@@ -7,6 +7,7 @@ import torch
 from scipy.interpolate import interp1d
 from scipy import special as scispc
 import copy
+from collections import OrderedDict
 
 from . import utils, linalg
 from .utils import _float, _cfloat
@@ -412,8 +413,35 @@ def gen_fourier_A(x, Ndeg=None, device=None, fft_norm='ortho'):
     return A, freqs
 
 
+# least-recently-used cache of gen_poly_A outputs, holding
+# at most _POLY_A_CACHE_MAXSIZE entries. See clear_poly_A_cache()
+_POLY_A_CACHE = OrderedDict()
+_POLY_A_CACHE_MAXSIZE = 128
+
+
+def clear_poly_A_cache():
+    """
+    Clear the cache of polynomial design matrices
+    generated by gen_poly_A()
+    """
+    _POLY_A_CACHE.clear()
+
+
+def _poly_A_key(x, *args):
+    """
+    Get a hashable key for gen_poly_A given x and its other args
+    """
+    if isinstance(x, torch.Tensor):
+        x = x.detach().cpu().numpy()
+    x = np.asarray(x, dtype=np.float64)
+    args = tuple(float(a) if isinstance(a, (torch.Tensor, np.ndarray)) else a for a in args)
+
+    return (x.tobytes(),) + args
+
+
 def gen_poly_A(x, Ndeg, device=None, basis='direct', d0=None,
-               logx=False, whiten=True, x0=None, dx=None, qr=False):
+               logx=False, whiten=True, x0=None, dx=None, qr=False,
+               cache=True):
     """
     Generate design matrix (A) for polynomial of Ndeg across x,
     with coefficient ordering
@@ -450,12 +478,27 @@ def gen_poly_A(x, Ndeg, device=None, basis='direct', d0=None,
         orthogonal (i.e. gram-schmidt). Note this makes A effectively
         the same as basis='legendre', whiten=True, regardless of 
         the chosen basis or x0, dx.
+    cache : bool, optional
+        If True (default), store A in a module-level
+        least-recently-used cache keyed by all of the inputs,
+        and return the cached A on subsequent calls with the
+        same inputs (e.g. many responses sharing a freq or time
+        grid). The cache holds at most _POLY_A_CACHE_MAXSIZE
+        matrices. Note the cached A is shared, so it should
+        not be modified inplace.
 
     Returns
     -------
     A : tensor
         Polynomial design matrix (Nx, Ndeg)
     """
+    if cache:
+        key = _poly_A_key(x, Ndeg, str(device), basis, d0, logx,
+                          whiten, x0, dx, qr, _float())
+        if key in _POLY_A_CACHE:
+            _POLY_A_CACHE.move_to_end(key)
+            return _POLY_A_CACHE[key]
+
     x, _, _ = utils.prep_xarr(x, d0=d0, logx=logx, whiten=whiten, x0=x0, dx=dx)
 
     # setup the polynomial
@@ -477,6 +520,11 @@ def gen_poly_A(x, Ndeg, device=None, basis='direct', d0=None,
 
     A = torch.as_tensor(A, dtype=_float(), device=device)
 
+    if cache:
+        _POLY_A_CACHE[key] = A
+        while len(_POLY_A_CACHE) > _POLY_A_CACHE_MAXSIZE:
+            _POLY_A_CACHE.popitem(last=False)
+
     return A
 
 
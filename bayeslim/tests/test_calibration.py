@@ -184,3 +184,430 @@ def test_RedVisCoupling_sympy():
 	# compare RedVisModel against analytic result
 	r = vout[[bl for bl in vout.bls]].numpy() / np.array([Vc[bl[0], bl[1]] for bl in vout.bls])
 	assert np.isclose(r, 1 + 0j, atol=1e-10).all()
+
+
+def setup_linear_array(Nants=10, direction=(1., 0.), noise=1e-12):
+	# a collinear array along direction, with float noise
+	# in the antenna positions perpendicular to it
+	torch.manual_seed(0)
+	ants = list(range(Nants))
+	direction = torch.as_tensor(direction) / torch.as_tensor(direction).norm()
+	antvecs = torch.zeros(Nants, 3)
+	antvecs[:, :2] = torch.arange(Nants)[:, None] * 14.6 * direction
+	antvecs[:, :2] += torch.randn(Nants, 1) * noise * direction.flip(0) * torch.tensor([-1., 1.])
+
+	return ants, ba.utils.AntposDict(ants, antvecs)
+
+
+def test_compute_redcal_degen_collinear():
+	for direction in [(1., 0.), (1., 1.)]:
+		for noise in [0., 1e-12]:
+			ants, antpos = setup_linear_array(direction=direction, noise=noise)
+			# a phase slope along the array is the minimum-norm solution
+			slope = 0.01 * torch.as_tensor(direction) / torch.as_tensor(direction).norm()
+			phs = antpos.antvecs[:, :2] @ slope
+			gains = 2 * torch.exp(1j * phs)[None, None, :, None, None]
+			for wgts in [None, torch.linspace(1, 2, len(ants))]:
+				abs_amp, phs_slope = ba.calibration.compute_redcal_degen(gains, ants, antpos, wgts=wgts)
+				assert torch.isfinite(phs_slope).all()
+				assert torch.isclose(phs_slope[0, 0, :, 0, 0], slope, atol=1e-10).all()
+
+			# the slope maps back to the input phases
+			g = ba.calibration.redcal_degen_gains(phs_slope=phs_slope, antpos=antpos)
+			assert torch.isclose(g, gains / 2, atol=1e-10).all()
+
+
+def test_compute_redcal_degen_vis_collinear():
+	for direction in [(1., 0.), (1., 1.)]:
+		for noise in [0., 1e-12]:
+			# EW-only (or off-axis collinear) baselines
+			ants, antpos = setup_linear_array(direction=direction, noise=noise)
+			bls = [(ants[0], a) for a in ants[1:]] + [(ants[1], a) for a in ants[2:]]
+			ant1, ant2 = zip(*bls)
+			blvecs = (antpos[ant1] - antpos[ant2])[:, :2]
+			slope = 0.01 * torch.as_tensor(direction) / torch.as_tensor(direction).norm()
+			vis = 3 * torch.exp(1j * (blvecs @ slope))[None, None, :, None, None]
+			for wgts in [None, torch.linspace(1, 2, len(bls))]:
+				abs_amp, phs_slope = ba.calibration.compute_redcal_degen_vis(
+					vis, wgts=wgts, bls=bls, antpos=antpos)
+				assert torch.isfinite(phs_slope).all()
+				assert torch.isclose(phs_slope[0, 0, :, 0, 0], slope, atol=1e-10).all()
+
+
+def test_redcal_degen_gains():
+	ants, antpos = setup_linear_array(Nants=5, direction=(1., 1.), noise=0.)
+	torch.manual_seed(0)
+	abs_amp = torch.randn(1, 1, 1, len(times), len(freqs)) * 0.1
+	phs_slope = torch.randn(1, 1, 2, len(times), len(freqs)) * 0.01
+	phs = torch.einsum("ijk...,ak->ija...", phs_slope, antpos.antvecs[:, :2])
+
+	# amplitude only
+	g = ba.calibration.redcal_degen_gains(abs_amp=abs_amp[0, 0, 0])
+	assert g.shape == (1, 1, 1, len(times), len(freqs))
+	assert g.dtype == ba._cfloat()
+	assert torch.isclose(g, torch.exp(abs_amp).to(g.dtype)).all()
+
+	# mixed float32 and float64 input
+	ref = torch.exp(abs_amp) * torch.exp(1j * phs)
+	for amp_dtype, phs_dtype in [(torch.float32, torch.float64), (torch.float64, torch.float32),
+								 (torch.float32, torch.float32)]:
+		g = ba.calibration.redcal_degen_gains(abs_amp=abs_amp.to(amp_dtype),
+											  phs_slope=phs_slope.to(phs_dtype), antpos=antpos)
+		assert g.shape == (1, 1, len(ants), len(times), len(freqs))
+		assert g.dtype == ba._cfloat()
+		assert torch.isclose(g, ref, atol=1e-6).all()
+		g = ba.calibration.redcal_degen_gains(abs_amp=abs_amp.to(amp_dtype))
+		assert g.dtype == ba._cfloat()
+
+def setup_Jones(freqs=freqs, times=times, **kwargs):
+	# setup HERA-7 array and mock visibilities
+	ants, antvecs = ba.utils._make_hex(2)
+	antpos = dict(zip(ants, torch.as_tensor(antvecs)))
+	array = ba.telescope_model.ArrayModel(antpos)
+	bls = array.get_bls(uniq_bls=False)
+	torch.manual_seed(0)
+	vd = ba.VisData()
+	vd.setup_meta(antpos=antpos)
+	data = torch.randn(1, 1, len(bls), len(times), len(freqs), dtype=ba._cfloat())
+	vd.setup_data(bls, times, freqs, data=data)
+
+	# setup JonesModel
+	params = torch.randn(1, 1, len(ants), len(times), len(freqs), dtype=ba._cfloat())
+	R = ba.calibration.JonesResponse(freq_kwargs={'freqs': freqs}, time_kwargs={'times': times})
+	J = ba.calibration.JonesModel(params, ants, R=R, **kwargs)
+
+	return J, vd
+
+
+def test_JonesModel_gain_cache():
+	def check(J, vd, undo=False):
+		gains = J.index_params(J.R(J.params), times=vd.times)
+		ref, _ = ba.calibration.apply_cal(vd.data, vd.bls, gains, J.ants, undo=undo)
+		assert torch.isclose(J(vd, undo=undo).data, ref).all()
+
+	# gain product caching is off by default
+	J, vd = setup_Jones()
+	with torch.no_grad():
+		check(J, vd)
+	assert J._gain_cache is None
+
+	J, vd = setup_Jones(cache_gains=True)
+	with torch.no_grad():
+		# the first call fills the cache, which a repeated call reuses
+		check(J, vd)
+		G = J._gain_cache['G'][None]
+		check(J, vd)
+		check(J, vd, undo=True)
+		assert J._gain_cache['G'][None] is G
+
+		# an inplace (e.g. optimizer) update of params invalidates the cache
+		J.params.mul_(2)
+		check(J, vd)
+		assert J._gain_cache['G'][None] is not G
+		G = J._gain_cache['G'][None]
+
+		# as does a change to the response function state
+		J.R.base0 = torch.ones_like(J.params)
+		check(J, vd)
+		assert J._gain_cache['G'][None] is not G
+		G = J._gain_cache['G'][None]
+
+		# or swapping out the response function
+		J.R = ba.calibration.JonesResponse(freq_kwargs={'freqs': freqs}, time_kwargs={'times': times})
+		check(J, vd)
+		assert J._gain_cache['G'][None] is not G
+		G = J._gain_cache['G'][None]
+
+		# or selecting different times or baselines
+		vd2 = vd.select(times=times[:2], inplace=False)
+		check(J, vd2)
+		assert J._gain_cache['G'][None].shape[-2] == 2
+		vd2 = vd.select(bl=vd.bls[:5], inplace=False)
+		check(J, vd2)
+		assert J._gain_cache['G'][None].shape[2] == 5
+
+	# gains that require grad are never cached
+	J.clear_cache()
+	check(J, vd)
+	assert J._gain_cache is None
+
+
+def test_cal_dtype():
+	for cache_gains in [False, True]:
+		J, vd = setup_Jones(cache_gains=cache_gains, cal_dtype=torch.complex64)
+		with torch.no_grad():
+			# forward-only reduced precision matches full precision
+			out = J(vd).data
+			J.cal_dtype = None
+			J.clear_cache()
+			ref = J(vd).data
+			J.cal_dtype = torch.complex64
+		assert out.dtype == ref.dtype
+		assert not torch.isclose(out, ref, rtol=1e-12, atol=0).all()
+		assert torch.isclose(out, ref, rtol=1e-5, atol=1e-6).all()
+
+		# reduced precision is not used when a gradient is needed
+		out = J(vd).data
+		assert out.requires_grad
+		assert torch.isclose(out.detach(), ref, rtol=1e-12, atol=0).all()
+
+		# including when only vis requires grad with frozen gains
+		J.params.requires_grad_(False)
+		vd.data.requires_grad_(True)
+		out = J(vd).data
+		assert out.requires_grad
+		assert torch.isclose(out.detach(), ref, rtol=1e-12, atol=0).all()
+
+	# delay gains in half precision
+	J, vd = setup_Jones()
+	dly_vis = vd.data.real.contiguous()
+	dly_gains = J.params.detach().real.contiguous()
+	ref, _ = ba.calibration.apply_cal(dly_vis, vd.bls, dly_gains, J.ants, vis_type='dly')
+	out, _ = ba.calibration.apply_cal(dly_vis, vd.bls, dly_gains, J.ants, vis_type='dly',
+									  cal_dtype=torch.float16)
+	assert out.dtype == ref.dtype
+	assert torch.isclose(out, ref, rtol=1e-2, atol=1e-2).all()
+
+
+def setup_linear_Response(param_type='com', freqs=freqs, times=times, **kwargs):
+	# JonesResponse with polynomial freq and time models
+	freq_kwargs = dict(freqs=freqs, linear_mode='poly', Ndeg=3)
+	time_kwargs = dict(times=times, linear_mode='poly', Ndeg=2)
+	return ba.calibration.JonesResponse(freq_mode='linear', time_mode='linear',
+										param_type=param_type, freq_kwargs=freq_kwargs,
+										time_kwargs=time_kwargs, **kwargs)
+
+
+def linear_Response_ref(R, params):
+	# pass params through the freq and time LinearModels one by one
+	if R.param_type == 'com' and not torch.is_complex(params):
+		params = ba.utils.viewcomp(params)
+	params = R.time_LM(R.freq_LM(params))
+
+	return R.params2complex(params)
+
+
+def test_Response_real_linear_setup():
+	torch.manual_seed(0)
+	R = setup_linear_Response()
+	assert R._real_A is not None and R._fused_A is not None
+	params = torch.randn(1, 1, 3, 2, 3, 2)
+	assert torch.isclose(R(params), linear_Response_ref(R, params)).all()
+
+	# setting up new freqs or times updates the cached A matrices
+	freqs2 = torch.linspace(140e6, 160e6, 20)
+	R.setup_freqs(freqs=freqs2, linear_mode='poly', Ndeg=3, whiten=False)
+	times2 = torch.linspace(2458168.1, 2458168.5, 7)
+	R.setup_times(times=times2, linear_mode='poly', Ndeg=2)
+	out = R(params)
+	assert out.shape[-2:] == (len(times2), len(freqs2))
+	assert torch.isclose(out, linear_Response_ref(R, params)).all()
+
+	# as does directly replacing a LinearModel
+	R.freq_LM = ba.linear_model.LinearModel('poly', dim=R.freq_dim, x=freqs, Ndeg=3,
+											dtype=ba._cfloat())
+	out = R(params)
+	assert out.shape[-1] == len(freqs)
+	assert torch.isclose(out, linear_Response_ref(R, params)).all()
+
+	# complex-valued A matrices aren't applied to 2-real params
+	R.freq_LM.A = R.freq_LM.A * np.exp(0.1j)
+	out = R(params)
+	assert R._real_A is None
+	assert torch.isclose(out, linear_Response_ref(R, params)).all()
+
+
+def test_Response_fused_linear():
+	torch.manual_seed(0)
+	for param_type, cast in [('com', False), ('com', True), ('real', False), ('amp', False)]:
+		R = setup_linear_Response(param_type)
+		assert R._fused_A is not None
+		params = torch.randn(1, 1, 3, 2, 3, 2)
+		if param_type != 'com':
+			params = params[..., 0]
+		elif cast:
+			params = ba.utils.viewcomp(params)
+
+		# the fused einsum matches applying each LinearModel in turn
+		out = R(params)
+		assert out.shape[-2:] == (len(times), len(freqs))
+		assert torch.isclose(out, linear_Response_ref(R, params)).all()
+		p = ba.utils.viewcomp(params) if param_type == 'com' and not cast else params
+		fused = R.forward_linear(p, **R._fused_A)
+		assert torch.isclose(fused, R.time_LM(R.freq_LM(p))).all()
+
+
+def test_Response_linear_dtype():
+	torch.manual_seed(0)
+	for param_type, cast in [('com', False), ('com', True), ('real', False)]:
+		R = setup_linear_Response(param_type, linear_dtype=torch.bfloat16)
+		params = torch.randn(1, 1, 3, 2, 3, 2)
+		if param_type != 'com':
+			params = params[..., 0]
+		elif cast:
+			params = ba.utils.viewcomp(params)
+		ref = linear_Response_ref(R, params)
+		out = R(params)
+		assert out.dtype == ref.dtype
+		if cast:
+			# complex params are applied in full precision
+			assert torch.isclose(out, ref).all()
+		else:
+			assert torch.isclose(out, ref, rtol=2e-2, atol=2e-2).all()
+
+		# reduced precision A matrices are upcast for complex params
+		p = ba.utils.viewcomp(torch.randn(1, 1, 3, 2, 3, 2))
+		fused = R.forward_linear(p, **R._fused_A)
+		assert fused.dtype == p.dtype
+		ref = R.time_LM(R.freq_LM(p, A=R.freq_LM.A.to(p.dtype)), A=R.time_LM.A.to(p.dtype))
+		assert torch.isclose(fused, ref).all()
+
+
+def test_JonesResponse_slope_dtype():
+	# slope params whose dtype differs from the default
+	ants, antvecs = ba.utils._make_hex(2)
+	antpos = dict(zip(ants, torch.as_tensor(antvecs)))
+	torch.manual_seed(0)
+	for param_type in ['phs_slope', 'dly_slope']:
+		R = ba.calibration.JonesResponse(param_type=param_type, antpos=antpos,
+										 freq_kwargs={'freqs': freqs})
+		params = torch.randn(1, 1, 2, len(times), len(freqs)) * 1e-3
+		ref = R(params)
+		for dtype in [torch.float32, torch.float64]:
+			out = R(params.to(dtype))
+			assert torch.isclose(out.to(ref.dtype), ref, atol=1e-5).all()
+
+		# including after pushing the response to a new dtype
+		R.push(torch.float32)
+		out = R(params.to(torch.float32))
+		assert torch.isclose(out.to(ref.dtype), ref, atol=1e-5).all()
+
+
+def test_JonesResponse_dly_setup_freqs():
+	# the delay phasor follows the frequencies given to setup_freqs()
+	torch.manual_seed(0)
+	R = ba.calibration.JonesResponse(param_type='dly', freq_kwargs={'freqs': freqs})
+	params = torch.randn(1, 1, 3, len(times), 1)
+	new_freqs = freqs * 1.5
+	R.setup_freqs(freqs=new_freqs)
+	ref = torch.exp(2j * np.pi * params * torch.as_tensor(new_freqs) / 1e9)
+	assert torch.isclose(R(params), ref, atol=1e-12).all()
+
+def test_jones_apply_4pol():
+	torch.manual_seed(0)
+	shape = (2, 2, 6, len(times), len(freqs))
+	g1 = torch.randn(shape, dtype=ba._cfloat())
+	g2 = torch.randn(shape, dtype=ba._cfloat())
+	vis = torch.randn(shape, dtype=ba._cfloat())
+	# a Hermitian 2x2 covariance per (bl, time, freq)
+	c = torch.randn(shape, dtype=ba._cfloat())
+	cov = torch.einsum("ab...,cb...->ac...", c, c.conj())
+
+	for inp in [vis, cov]:
+		out = ba.calibration._jones_apply_4pol(g1, inp, g2)
+		ref = torch.einsum("ab...,bc...,dc...->ad...", g1, inp, g2.conj())
+		assert torch.isclose(out, ref, atol=1e-12).all()
+
+	# J C J^dagger of a Hermitian C stays Hermitian
+	out = ba.calibration._jones_apply_4pol(g1, cov, g1)
+	assert torch.isclose(out, out.transpose(0, 1).conj(), atol=1e-12).all()
+
+	# including through apply_cal with broadcasted (non-contiguous) gains
+	ants = list(range(4))
+	bls = [(0, 1), (0, 2), (1, 3), (2, 3), (3, 3), (1, 0)]
+	gains = torch.randn(2, 2, len(ants), 1, len(freqs), dtype=ba._cfloat())
+	gains = gains.expand(-1, -1, -1, len(times), -1)
+	out, _ = ba.calibration.apply_cal(vis, bls, gains, ants)
+	ant1, ant2 = zip(*bls)
+	ref = torch.einsum("ab...,bc...,dc...->ad...", gains[:, :, list(ant1)], vis,
+					   gains[:, :, list(ant2)].conj())
+	assert torch.isclose(out, ref, atol=1e-12).all()
+
+
+def test_apply_cal_undo_4pol():
+	torch.manual_seed(0)
+	ants = list(range(4))
+	bls = [(0, 1), (0, 2), (1, 3), (2, 3), (3, 3), (1, 0)]
+	vis = torch.randn(2, 2, len(bls), len(times), len(freqs), dtype=ba._cfloat())
+	# well-conditioned Jones matrices near the identity
+	gains = torch.eye(2)[:, :, None, None, None] \
+			+ 0.3 * torch.randn(2, 2, len(ants), len(times), len(freqs), dtype=ba._cfloat())
+
+	# applying and then undoing the gains recovers the input
+	out, _ = ba.calibration.apply_cal(vis, bls, gains, ants)
+	assert not torch.isclose(out, vis).all()
+	undo, _ = ba.calibration.apply_cal(out, bls, gains, ants, undo=True)
+	assert torch.isclose(undo, vis, atol=1e-10).all()
+
+
+
+def test_JonesModel_lazy_refant():
+	def refant_fixed(J):
+		refant = J.params[:, :, J.refant_idx]
+		return torch.isclose(refant.imag, torch.zeros(1), atol=1e-12).all()
+
+	def perturb(J):
+		# write through .data, which doesn't bump the params version
+		version = J.params._version
+		J.params.data[:] = J.params.data * torch.exp(1j * torch.randn_like(J.params.real))
+		assert J.params._version == version
+		assert not refant_fixed(J)
+
+	# by default the refant is fixed on every forward
+	J, vd = setup_Jones(refant=0)
+	assert refant_fixed(J)
+	perturb(J)
+	J(vd)
+	assert refant_fixed(J)
+
+	# with lazy_refant, repeated forward passes skip the refant fix
+	J, vd = setup_Jones(refant=0, lazy_refant=True)
+	calls = []
+	fix_refant_phs = J.fix_refant_phs
+	def count_fix():
+		calls.append(1)
+		fix_refant_phs()
+	J.fix_refant_phs = count_fix
+	J(vd)
+	J(vd)
+	assert len(calls) == 0
+
+	# until an optimizer step, here one that writes through .data
+	class DataSGD(torch.optim.Optimizer):
+		def __init__(self, params, lr=0.1):
+			super().__init__(params, dict(lr=lr))
+
+		def step(self, closure=None):
+			for group in self.param_groups:
+				for p in group['params']:
+					p.data.add_(p.grad, alpha=-group['lr'])
+
+	opt = DataSGD([J.params])
+	version = J.params._version
+	(J(vd).data - vd.data).abs().pow(2).sum().backward()
+	opt.step()
+	assert J.params._version == version
+	assert not refant_fixed(J)
+	J(vd)
+	assert len(calls) == 1
+	assert refant_fixed(J)
+	J(vd)
+	assert len(calls) == 1
+
+	# params reassignment, load_state_dict and push also invalidate the fix
+	def reassign():
+		J.params = torch.nn.Parameter(J.params.detach().clone())
+	for invalidate in [reassign, lambda: J.load_state_dict(J.state_dict()),
+					   lambda: J.push('cpu')]:
+		N = len(calls)
+		invalidate()
+		J(vd)
+		assert len(calls) == N + 1
+		J(vd)
+		assert len(calls) == N + 1
+
+	# a bare .data write outside an optimizer needs clear_cache()
+	perturb(J)
+	J.clear_cache()
+	J(vd)
+	assert refant_fixed(J)
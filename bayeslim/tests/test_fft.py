@@ -0,0 +1,78 @@
+import numpy as np
+
+import torch
+torch.set_default_dtype(torch.float64)
+
+import bayeslim as ba
+
+
+def test_PeakDelay():
+	# complex sinusoids with known delays
+	N, dx = 64, 1.0
+	x = torch.arange(N) * dx
+	dlys = torch.tensor([-0.2, 0.05, 0.1234, 0.31])
+	inp = torch.exp(2j * np.pi * dlys[:, None] * x)
+
+	# peak along last dim
+	PD = ba.fft.PeakDelay(dim=1, N=N, dx=dx)
+	out = PD(inp)
+	assert out.shape == (len(dlys), 1)
+	assert torch.isclose(out[:, 0], dlys, atol=1e-3).all()
+
+	# vectorized peak matches 1D peak estimation
+	FT = ba.fft.FFT(dim=0, N=N, dx=dx)
+	for i in range(len(dlys)):
+		assert torch.isclose(PD.get_peak(FT(inp[i])), out[i, 0])
+
+	# peak along a non-trailing dim of a batched tensor
+	inp2 = torch.stack([inp, inp * 2]).moveaxis(-1, 1)
+	PD = ba.fft.PeakDelay(dim=1, N=N, dx=dx)
+	out2 = PD(inp2)
+	assert out2.shape == (2, 1, len(dlys))
+	assert torch.isclose(out2[0, 0], out[:, 0]).all()
+	assert torch.isclose(out2[1, 0], out[:, 0]).all()
+
+
+def test_PeakDelay_wrap():
+	# peaks in the first and last bins use wrap-around neighbors
+	N, dx = 64, 1.0
+	x = torch.arange(N) * dx
+	PD = ba.fft.PeakDelay(dim=-1, N=N, dx=dx)
+	dlys = torch.stack([PD.freqs[0] + 0.2 * PD.df, PD.freqs[-1] - 0.2 * PD.df])
+	inp = torch.exp(2j * np.pi * dlys[:, None] * x)
+	out = PD(inp)
+	assert torch.isclose(out[:, 0], dlys, atol=1e-3).all()
+
+
+def test_PeakDelay_rfft():
+	# real sinusoids with the real-input FFT
+	N, dx = 64, 1.0
+	x = torch.arange(N) * dx
+	dlys = torch.tensor([0.05, 0.1234, 0.31])
+	inp = torch.cos(2 * np.pi * dlys[:, None] * x)
+	PD = ba.fft.PeakDelay(dim=-1, N=N, dx=dx, rfft=True)
+	out = PD(inp)
+	assert out.shape == (len(dlys), 1)
+	assert torch.isclose(out[:, 0], dlys, atol=1e-2).all()
+
+
+def test_PeakDelay_rfft_edge():
+	# odd and even length real sinusoids peaking in the last bin
+	dx = 1.0
+	for N in [63, 64]:
+		x = torch.arange(N) * dx
+		PD = ba.fft.PeakDelay(dim=-1, N=N, dx=dx, rfft=True)
+		dlys = PD.freqs[-1] - torch.tensor([0.1, 0.2, 0.3]) * PD.df
+		inp = torch.cos(2 * np.pi * dlys[:, None] * x + 0.7)
+		assert (torch.fft.rfft(inp).abs().argmax(-1) == len(PD.freqs) - 1).all()
+		# the reflected neighbors match those of the full FFT
+		PF = ba.fft.PeakDelay(dim=-1, N=N, dx=dx, fftshift=False)
+		assert torch.isclose(PD(inp), PF(inp)).all()
+
+	# odd length real sinusoids away from the edges
+	N = 63
+	x = torch.arange(N) * dx
+	dlys = torch.tensor([0.05, 0.1234, 0.31])
+	inp = torch.cos(2 * np.pi * dlys[:, None] * x)
+	PD = ba.fft.PeakDelay(dim=-1, N=N, dx=dx, rfft=True)
+	assert torch.isclose(PD(inp)[:, 0], dlys, atol=1e-2).all()
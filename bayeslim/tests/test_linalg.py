@@ -0,0 +1,58 @@
+import numpy as np
+
+import torch
+torch.set_default_dtype(torch.float64)
+
+import bayeslim as ba
+
+
+def test_mat_inv():
+	torch.manual_seed(0)
+	for N in [1, 2]:
+		for dtype in [torch.float64, ba._cfloat()]:
+			a = torch.randn(N, N, 5, 3, 4, dtype=dtype)
+			ainv = ba.linalg.mat_inv(a)
+			ref = torch.linalg.inv(a.movedim((0, 1), (-2, -1))).movedim((-2, -1), (0, 1))
+			assert ainv.shape == a.shape
+			assert torch.isclose(ainv, ref, atol=1e-10).all()
+
+
+def test_cmatmul():
+	torch.manual_seed(0)
+	for N in [1, 2]:
+		a = torch.randn(N, N, 3, 4, dtype=ba._cfloat())
+		b = torch.randn(N, N, 3, 4, dtype=ba._cfloat())
+		ref = torch.einsum("ij...,jk...->ik...", a, b)
+		# complex and contiguous 2-real input
+		assert torch.isclose(ba.linalg.cmatmul(a, b), ref).all()
+		out = ba.linalg.cmatmul(ba.utils.viewreal(a), ba.utils.viewreal(b))
+		assert torch.isclose(ba.utils.viewcomp(out), ref).all()
+		# non-contiguous 2-real input, with the 2-real axis strided
+		ar = torch.stack([a.real, a.imag])
+		br = torch.stack([b.real, b.imag])
+		ar, br = ar.movedim(0, -1), br.movedim(0, -1)
+		assert not ar.is_contiguous()
+		out = ba.linalg.cmatmul(ar, br)
+		assert torch.isclose(ba.utils.viewcomp(out), ref).all()
+
+
+def test_cinv():
+	torch.manual_seed(0)
+	for N in [1, 2, 3]:
+		z = torch.randn(5, N, N, dtype=ba._cfloat())
+		ref = torch.linalg.inv(z)
+		# complex and contiguous 2-real input
+		assert torch.isclose(ba.linalg.cinv(z), ref).all()
+		out = ba.linalg.cinv(ba.utils.viewreal(z))
+		assert torch.isclose(ba.utils.viewcomp(out), ref).all()
+		# non-contiguous 2-real input: a transposed view
+		if N > 1:
+			zt = ba.utils.viewreal(z.transpose(-2, -1).contiguous()).transpose(-3, -2)
+			assert not zt.is_contiguous()
+			out = ba.linalg.cinv(zt)
+			assert torch.isclose(ba.utils.viewcomp(out), ref).all()
+		# non-contiguous 2-real input: a sliced view
+		zs = torch.stack([z.real, z.imag, z.real], dim=-1)[..., :2]
+		assert not zs.is_contiguous()
+		out = ba.linalg.cinv(zs)
+		assert torch.isclose(ba.utils.viewcomp(out), ref).all()
@@ -0,0 +1,34 @@
+import numpy as np
+
+import torch
+torch.set_default_dtype(torch.float64)
+
+import bayeslim as ba
+
+
+def test_gen_poly_A_cache():
+	lm = ba.linear_model
+	lm.clear_poly_A_cache()
+	x = torch.linspace(120e6, 130e6, 10)
+
+	# repeated calls return the cached A
+	A = lm.gen_poly_A(x, 3)
+	assert lm.gen_poly_A(x, 3) is A
+	assert torch.isclose(A, lm.gen_poly_A(x, 3, cache=False)).all()
+
+	# a different x of the same length is a different entry
+	A2 = lm.gen_poly_A(x + 1e6, 3)
+	assert A2 is not A
+	assert torch.isclose(A2, lm.gen_poly_A(x + 1e6, 3, cache=False)).all()
+
+	# the cache is bounded, evicting the least recently used A
+	lm.clear_poly_A_cache()
+	A = lm.gen_poly_A(x, 3)
+	for i in range(lm._POLY_A_CACHE_MAXSIZE - 1):
+		lm.gen_poly_A(x + i + 1, 3)
+	assert lm.gen_poly_A(x, 3) is A
+	lm.gen_poly_A(x - 1, 3)
+	assert len(lm._POLY_A_CACHE) == lm._POLY_A_CACHE_MAXSIZE
+	assert lm.gen_poly_A(x, 3) is A
+	assert not any(k[0] == (x + 1).numpy().tobytes() for k in lm._POLY_A_CACHE)
+	lm.clear_poly_A_cache()
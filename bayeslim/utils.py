@@ -2190,7 +2190,7 @@ class AntposDict:
             of shape (Nants, 3)
         """
         self.ants = list(ants)
-        self._ant_idx = {a: self.ants.index(a) for a in self.ants}
+        self._ant_idx = {a: i for i, a in enumerate(self.ants)}
         try:
             # this works if antvec is 1) ndarray
             # 2) list of ndarray or 3) tensor
@@ -2220,6 +2220,42 @@ class AntposDict:
         idx = self._ant_idx[key]
         self.antvecs[idx] = value
 
+    def get_antvecs(self, ants=None):
+        """
+        Get antenna vectors for a list of antennas. If ants
+        matches self.ants (or is None) this returns self.antvecs
+        directly, avoiding a per-antenna lookup and copy.
+        Otherwise, the index tensor for ants is cached so repeated
+        calls are a single index_select.
+
+        Parameters
+        ----------
+        ants : list, optional
+            Antenna integers. Default is self.ants
+
+        Returns
+        -------
+        tensor
+            Antenna vectors of shape (Nants, 3)
+        """
+        if ants is None:
+            return self.antvecs
+        ants = ants.tolist() if isinstance(ants, (np.ndarray, torch.Tensor)) else list(ants)
+        if ants == self.ants:
+            return self.antvecs
+
+        key = tuple(ants)
+        if not hasattr(self, '_idx_cache'):
+            self._idx_cache = {}
+        if key not in self._idx_cache:
+            self._idx_cache[key] = torch.as_tensor([self._ant_idx[a] for a in ants])
+        idx = self._idx_cache[key]
+        if idx.device != self.antvecs.device:
+            idx = idx.to(self.antvecs.device)
+            self._idx_cache[key] = idx
+
+        return self.antvecs.index_select(0, idx)
+
     def __repr__(self):
         return "Antpos{{{}}}".format(self.ants)
 
@@ -2227,7 +2263,9 @@ class AntposDict:
         return len(self.ants)
 
     def __contains__(self, key):
-        return key in self.ants
+        if isinstance(key, torch.Tensor):
+            key = key.item()
+        return key in self._ant_idx
 
     def __iter__(self):
         return self.keys()